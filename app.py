@@ -1,41 +1,115 @@
+import click  # opsi perintah CLI tambahan
 from flask import Flask  # impor kelas inti aplikasi web Flask
+from flask.cli import with_appcontext
 from flask_sqlalchemy import SQLAlchemy  # impor ORM yang terintegrasi dengan Flask
 from flask_migrate import Migrate  # impor helper migrasi berbasis Alembic
+from flask_migrate.cli import db as db_commands  # grup perintah `flask db`
+
+# model dan URI database berasal dari modul inti yang tidak bergantung pada Flask
+from core import (
+    DATABASE_URI,
+    PRAGMA_PROFILE,
+    READ_POOL_SIZE,
+    SPLIT_READS,
+    Base,
+    Ruangan,
+    RuanganUser,
+    User,
+    apply_pragma_profile,
+    can_split_reads,
+    engine_options,
+    read_only_uri,
+    reconcile_occupant_counts,
+)
+from migration_helpers import timing_history
 
 # buat instance aplikasi Flask dan jadikan modul ini sebagai titik masuk
 app = Flask(__name__)
-# atur koneksi database: gunakan SQLite lokal bernama db.sqlite3
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///db.sqlite3'
+# atur koneksi database: DATABASE_URL bila diset, selain itu SQLite lokal db.sqlite3 yang sama dengan CLI
+app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URI
+# profil PRAGMA SQLite (lihat core.PRAGMA_PROFILES); bawaan dari env SQLITE_PRAGMA_PROFILE atau "wal"
+app.config['SQLITE_PRAGMA_PROFILE'] = PRAGMA_PROFILE
+# pisahkan engine baca (read-only, berpool) dari engine tulis (satu koneksi); env DATABASE_SPLIT_READS=1
+app.config['SQLITE_SPLIT_READS'] = SPLIT_READS and can_split_reads(DATABASE_URI)
+app.config['SQLITE_READ_POOL_SIZE'] = READ_POOL_SIZE
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(DATABASE_URI, 'writer', app.config['SQLITE_SPLIT_READS'])
+if app.config['SQLITE_SPLIT_READS']:
+    read_uri = read_only_uri(DATABASE_URI)
+    app.config['SQLALCHEMY_BINDS'] = {
+        'reader': {
+            'url': read_uri,
+            **engine_options(read_uri, 'reader', read_pool_size=app.config['SQLITE_READ_POOL_SIZE']),
+        },
+    }
 
-# inisialisasi objek ORM SQLAlchemy yang terhubung ke aplikasi
-db = SQLAlchemy(app)
+# inisialisasi objek ORM SQLAlchemy yang terhubung ke aplikasi; metadata model inti
+# dipakai bersama agar Flask-Migrate/Alembic tetap mengenali semua tabel
+db = SQLAlchemy(app, metadata=Base.metadata)
+with app.app_context():
+    apply_pragma_profile(db.engine, app.config['SQLITE_PRAGMA_PROFILE'])
+    if 'reader' in db.engines:
+        apply_pragma_profile(db.engines['reader'], app.config['SQLITE_PRAGMA_PROFILE'], read_only=True)
 # daftarkan Flask-Migrate agar perintah migrasi CLI bisa berjalan
 migrate = Migrate(app, db)
 
 
-class User(db.Model):
-    """Model tabel user dengan kolom id, name, dan email."""
+@app.cli.command('check-indexes')
+def check_indexes() -> None:
+    """Pastikan query yang sering dipakai memakai indeks (EXPLAIN QUERY PLAN)."""
+    hot_queries = {
+        'relasi per pengguna & ruangan': db.session.query(RuanganUser).filter_by(user_id=1, ruangan_id=1),
+        'relasi per pengguna': db.session.query(RuanganUser).filter_by(user_id=1),
+        'relasi per ruangan': db.session.query(RuanganUser).filter_by(ruangan_id=1),
+        'pengguna per email': db.session.query(User).filter_by(email='contoh@example.com'),
+    }
+
+    failed = False
+    for label, query in hot_queries.items():
+        sql = str(query.statement.compile(db.engine, compile_kwargs={'literal_binds': True}))
+        plan = [row[3] for row in db.session.execute(db.text('EXPLAIN QUERY PLAN ' + sql))]
+        uses_index = all(step.startswith('SEARCH') and 'INDEX' in step for step in plan)
+        failed = failed or not uses_index
+        print(f"[{'OK' if uses_index else 'GAGAL'}] {label}: {'; '.join(plan)}")
+
+    if failed:
+        raise SystemExit(1)
+
 
-    # Penting: mewarisi db.Model agar SQLAlchemy/Alembic mengenali kelas ini sebagai tabel
-    # db.Column menerima tipe data dan opsi (mis. primary_key) untuk mendeskripsikan kolom tabel
-    id = db.Column(db.Integer, primary_key=True)  # primary key unik pengguna
-    name = db.Column(db.String(50))  # nama pengguna maksimal 50 karakter
-    email = db.Column(db.String(50))  # email pengguna maksimal 50 karakter
+@app.cli.command('reconcile-counts')
+def reconcile_counts() -> None:
+    """Hitung ulang jumlah penghuni ruangan bila trigger sempat terlewati."""
+    corrected = reconcile_occupant_counts(db.session)
+    db.session.commit()
+    print(f'{corrected} ruangan diperbaiki.')
 
 
-class Ruangan(db.Model):
-    """Model tabel ruangan dengan kolom id dan name."""
+@db_commands.command('timings')
+@click.option('--limit', default=20, show_default=True, help='Jumlah langkah terbaru yang ditampilkan')
+@click.option('--revision', default=None, help='Hanya tampilkan riwayat satu revisi')
+@with_appcontext
+def migration_timings(limit: int, revision: str | None) -> None:
+    """Tampilkan lama tiap langkah migrasi yang pernah dijalankan."""
+    with db.engine.connect() as connection:
+        history = timing_history(connection, limit, revision)
+    if not history:
+        print('Belum ada riwayat migrasi.')
+        return
 
-    # semua kolom di bawah ini juga memakai db.Column dengan parameter tipe dan konfigurasi tambahan
-    id = db.Column(db.Integer, primary_key=True)  # primary key ruang
-    name = db.Column(db.String(50))  # nama ruangan
+    print(f"{'Waktu (UTC)':<19} {'Arah':<9} {'Revisi':<12} {'Durasi (ms)':>11} {'Pernyataan':>10} {'Baris':>9}  Deskripsi")
+    for step in history:
+        rows = '-' if step.rows is None else step.rows
+        print(
+            f"{step.applied_at:%Y-%m-%d %H:%M:%S} {step.direction:<9} {step.revision:<12} "
+            f"{step.duration_ms:>11.1f} {step.statements:>10} {rows:>9}  {step.description}"
+        )
 
 
-class RuanganUser(db.Model):
-    """Tabel relasi banyak-ke-banyak antara user dan ruangan."""
+@db_commands.command('estimate')
+@click.argument('revision', default='head')
+@click.option('--calibrate-rows', default=50_000, show_default=True, help='Ukuran tabel benchmark kalibrasi')
+@with_appcontext
+def estimate_migrations(revision: str, calibrate_rows: int) -> None:
+    """Perkirakan lama migrasi tertunda tanpa menulis ke database."""
+    from migration_estimate import print_estimate
 
-    # db.Column digunakan untuk mendefinisikan kolom tabel dengan tipe data dan opsi tambahan
-    # db.Model digunakan sebagai dasar untuk mendefinisikan model tabel
-    id = db.Column(db.Integer, primary_key=True)  # primary key relasi
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))  # referensi ke user
-    ruangan_id = db.Column(db.Integer, db.ForeignKey('ruangan.id'))  # referensi ke ruangan
\ No newline at end of file
+    print_estimate(revision, calibrate_rows)
@@ -0,0 +1,80 @@
+"""Ukur waktu cold start CLI dibanding memuat tumpukan Flask.
+
+Setiap modul diimpor di proses Python baru beberapa kali secara bergiliran
+(cli, app, core, cli, ...) agar gangguan beban mesin mengenai semua modul
+sama rata. Anggaran diperiksa terhadap waktu tercepat (min dari N), yang
+paling sedikit terpengaruh derau; median hanya ditampilkan. Skrip keluar
+dengan kode 1 bila impor ``cli`` melewati anggaran lebih dari ``--tolerance``
+(bawaan 15%), baik relatif terhadap ``app`` maupun dalam milidetik absolut::
+
+    python benchmarks/import_time.py --runs 20 --ratio 0.6 --budget-ms 250
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+TARGETS = {"core": "import core", "cli": "import cli", "app": "import app"}
+# waktu diukur di dalam proses anak sehingga biaya start interpreter tidak ikut dihitung
+PROBE = "import time; t = time.perf_counter(); {statement}; print(time.perf_counter() - t)"
+
+
+def measure_once(statement: str) -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(statement=statement)],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1]) * 1000
+
+
+def measure(runs: int) -> dict[str, list[float]]:
+    timings: dict[str, list[float]] = {name: [] for name in TARGETS}
+    for _ in range(runs):
+        for name, statement in TARGETS.items():
+            timings[name].append(measure_once(statement))
+    return timings
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20, help="Jumlah proses per modul")
+    parser.add_argument("--ratio", type=float, default=0.6, help="Batas waktu impor cli relatif terhadap app")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Batas absolut waktu impor cli (ms)")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.15, help="Kelonggaran relatif di atas batas sebelum dianggap gagal"
+    )
+    args = parser.parse_args(argv)
+
+    best = {}
+    for name, timings in measure(args.runs).items():
+        best[name] = min(timings)
+        print(
+            f"{name:>6}: min {best[name]:7.1f} ms  "
+            f"(median {statistics.median(timings):.1f}, maks {max(timings):.1f})"
+        )
+
+    ratio = best["cli"] / best["app"]
+    print(f"impor cli = {ratio:.0%} dari impor app (min dari {args.runs}, batas {args.ratio:.0%})")
+
+    # waktu impor di mesin yang sama masih bergeser beberapa persen antar-pengukuran;
+    # hanya lonjakan di atas kelonggaran yang dianggap regresi
+    slack = 1 + args.tolerance
+    failed = ratio > args.ratio * slack
+    if failed:
+        print(f"impor cli melewati batas {args.ratio:.0%} lebih dari {args.tolerance:.0%}")
+    if args.budget_ms is not None and best["cli"] > args.budget_ms * slack:
+        print(f"impor cli melewati anggaran {args.budget_ms:.0f} ms")
+        failed = True
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
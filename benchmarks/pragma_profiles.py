@@ -0,0 +1,108 @@
+"""Bandingkan profil PRAGMA SQLite pada beban papan dan penempatan.
+
+Setiap profil memakai salinan database sementara yang sama isinya, lalu
+menjalankan dua beban:
+
+* ``papan``: baca seluruh papan (ruangan, pengguna, relasi) berulang kali,
+  sambil satu thread lain terus menulis (pembaca vs penulis);
+* ``tempatkan``: penempatan satu per satu, masing-masing satu transaksi
+  (biaya commit), seperti ``POST /api/assign``.
+
+::
+
+    python benchmarks/pragma_profiles.py --users 20000 --assigns 500
+"""
+from __future__ import annotations
+
+import argparse
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+import repository  # noqa: E402
+from core import PRAGMA_PROFILES, Base, Ruangan, RuanganUser, User, apply_pragma_profile  # noqa: E402
+
+
+def build_template(path: Path, users: int, rooms: int) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.execute(insert(User), [{"name": f"user {i}", "email": f"user{i}@example.com"} for i in range(users)])
+        session.execute(insert(Ruangan), [{"name": f"ruang {i}"} for i in range(rooms)])
+        session.execute(
+            insert(RuanganUser), [{"user_id": i, "ruangan_id": i % rooms + 1} for i in range(1, users // 2)]
+        )
+        session.commit()
+    engine.dispose()
+
+
+def board_workload(engine, rounds: int) -> float:
+    """Waktu rata-rata satu pembacaan papan selagi penulis lain aktif (ms)."""
+    stop = threading.Event()
+
+    def writer() -> None:
+        with Session(engine) as session:
+            while not stop.is_set():
+                session.execute(insert(Ruangan).values(name="sibuk"))
+                session.commit()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        started = time.perf_counter()
+        with Session(engine) as session:
+            for _ in range(rounds):
+                repository.all_rooms(session)
+                repository.all_users(session)
+                repository.assignment_rows(session)
+                session.rollback()
+        return (time.perf_counter() - started) / rounds * 1000
+    finally:
+        stop.set()
+        thread.join()
+
+
+def assign_workload(engine, users: int, rooms: int, count: int) -> float:
+    """Waktu rata-rata satu penempatan yang di-commit sendiri (ms)."""
+    started = time.perf_counter()
+    with Session(engine) as session:
+        for i in range(count):
+            RuanganUser.create_if_absent(session, users // 2 + i, i % rooms + 1)
+            session.commit()
+    return (time.perf_counter() - started) / count * 1000
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--rooms", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=20, help="Jumlah pembacaan papan")
+    parser.add_argument("--assigns", type=int, default=500, help="Jumlah penempatan")
+    parser.add_argument("--profiles", nargs="*", default=list(PRAGMA_PROFILES))
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        template = Path(workdir) / "template.sqlite3"
+        build_template(template, args.users, args.rooms)
+
+        print(f"{'profil':<10} {'papan (ms)':>12} {'tempatkan (ms)':>16}")
+        for profile in args.profiles:
+            path = Path(workdir) / f"{profile}.sqlite3"
+            shutil.copy(template, path)
+            engine = apply_pragma_profile(create_engine(f"sqlite:///{path}"), profile)
+            board_ms = board_workload(engine, args.rounds)
+            assign_ms = assign_workload(engine, args.users, args.rooms, args.assigns)
+            engine.dispose()
+            print(f"{profile:<10} {board_ms:>12.1f} {assign_ms:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Bandingkan biaya per panggilan query ORM yang dibangun ulang dengan ``repository``.
+
+Database SQLite in-memory kecil dipakai agar waktu eksekusi SQL nyaris nol dan
+yang terukur terutama biaya membangun serta menyiapkan statement::
+
+    python benchmarks/query_overhead.py --calls 5000
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+import repository  # noqa: E402
+from core import Base, Ruangan, RuanganUser, User  # noqa: E402
+
+
+def seed(session: Session) -> None:
+    session.execute(insert(User), [{"name": f"user {i}", "email": f"user{i}@example.com"} for i in range(1, 201)])
+    session.execute(insert(Ruangan), [{"name": f"ruang {i}"} for i in range(1, 6)])
+    session.execute(insert(RuanganUser), [{"user_id": i, "ruangan_id": i % 5 + 1} for i in range(1, 101)])
+    session.commit()
+
+
+def cases(session: Session) -> dict[str, tuple]:
+    """Pasangan (sebelum, sesudah) untuk query yang sering dipanggil."""
+
+    def old_room_user_page():
+        return (
+            session.query(RuanganUser.id.label("assignment_id"), RuanganUser.user_id, User.name, User.email)
+            .join(User, User.id == RuanganUser.user_id)
+            .filter(RuanganUser.ruangan_id == 2, RuanganUser.id > 0)
+            .order_by(RuanganUser.id)
+            .limit(21)
+            .all()
+        )
+
+    def old_user_page():
+        return (
+            session.query(User)
+            .filter(User.id > 0)
+            .filter(~session.query(RuanganUser.id).filter(RuanganUser.user_id == User.id).exists())
+            .order_by(User.id)
+            .limit(21)
+            .all()
+        )
+
+    return {
+        "email terdaftar": (
+            lambda: session.query(User).filter_by(email="user7@example.com").first() is not None,
+            lambda: repository.email_taken(session, "user7@example.com"),
+        ),
+        "cari relasi": (
+            lambda: session.query(RuanganUser).filter_by(user_id=7, ruangan_id=3).first(),
+            lambda: repository.find_assignment(session, 7, 3),
+        ),
+        "halaman ruangan": (old_room_user_page, lambda: repository.room_user_page(session, 2, 0, 21)),
+        "halaman belum ditempatkan": (old_user_page, lambda: repository.user_page(session, 0, 21, True)),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=5_000, help="Jumlah panggilan per query")
+    args = parser.parse_args(argv)
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        seed(session)
+        print(f"{'query':<26} {'sebelum':>10} {'sesudah':>10}  (mikrodetik/panggilan)")
+        for label, (before, after) in cases(session).items():
+            before(), after()  # isi cache kompilasi lebih dulu
+            before_us = timeit.timeit(before, number=args.calls) / args.calls * 1e6
+            after_us = timeit.timeit(after, number=args.calls) / args.calls * 1e6
+            print(f"{label:<26} {before_us:>10.1f} {after_us:>10.1f}  ({before_us / after_us:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
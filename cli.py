@@ -1,35 +1,123 @@
+import argparse
+import json
+import shlex
 import sys
-from typing import Callable
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, TextIO
 
-from app import Ruangan, RuanganUser, User, db
+from sqlalchemy import delete
 
+import repository
+from core import Ruangan, RuanganUser, User, read_session, search_users, session
+from repository import LIST_SEPARATOR
+
+# jumlah baris yang diambil per batch saat daftar dibaca secara streaming
+STREAM_BATCH_SIZE = 500
+
+_batch_mode = False
+
+
+class CommandError(Exception):
+    """Kesalahan perintah yang pesannya langsung ditampilkan ke pengguna."""
+
+
+def commit() -> None:
+    """Commit perubahan, kecuali di mode batch yang commit sekali di akhir."""
+    if _batch_mode:
+        session.flush()
+    else:
+        session.commit()
+
+
+@contextmanager
+def batch_transaction() -> Iterator[None]:
+    global _batch_mode
+    _batch_mode = True
+    try:
+        yield
+        session.commit()
+    except BaseException:
+        session.rollback()
+        raise
+    finally:
+        _batch_mode = False
+
+
+def reader():
+    """Session untuk daftar dan pencarian: engine read-only bila ``DATABASE_SPLIT_READS=1``.
+
+    Mode batch tetap memakai session penulis agar perubahan yang belum di-commit terlihat.
+    """
+    return session if _batch_mode else read_session
+
+
+def print_json_rows(rows: Iterable[dict[str, object]]) -> None:
+    """Cetak array JSON elemen demi elemen agar daftar besar tetap streaming."""
+    separator = "["
+    for row in rows:
+        print(separator + json.dumps(row, ensure_ascii=False), end="")
+        separator = ",\n"
+    print("[]" if separator == "[" else "]")
+
+
+def split_names(value: str | None) -> list[str]:
+    return value.split(LIST_SEPARATOR) if value else []
 
-def list_users() -> None:
-    users = User.query.order_by(User.id).all()
-    if not users:
-        print("Tidak ada data pengguna.")
-        return
 
-    print("\nDaftar Pengguna:")
-    print("================")
-    for user in users:
-        assignments = (
-            RuanganUser.query.filter_by(user_id=user.id)
-            .join(Ruangan, RuanganUser.ruangan_id == Ruangan.id)
-            .add_columns(Ruangan.name.label("ruangan_name"))
-            .all()
+def list_users(limit: int | None = None, offset: int = 0, fmt: str = "text") -> None:
+    # satu query teragregasi (GROUP_CONCAT) dibaca bertahap, bukan satu query per pengguna
+    rows = repository.user_listing(reader(), limit, offset, STREAM_BATCH_SIZE)
+
+    if fmt == "json":
+        print_json_rows(
+            {"id": row.id, "name": row.name, "email": row.email, "ruangan": split_names(row.ruangan)} for row in rows
         )
-        ruang_list = ", ".join(row.ruangan_name for row in assignments) if assignments else "-"
+        return
 
+    empty = True
+    for row in rows:
+        if empty:
+            print("\nDaftar Pengguna:")
+            print("================")
+            empty = False
         print(
             "ID: {id}\nNama: {nama}\nEmail: {email}\nRuangan: {ruang}\n-".format(
-                id=user.id,
-                nama=user.name,
-                email=user.email,
-                ruang=ruang_list,
+                id=row.id,
+                nama=row.name,
+                email=row.email,
+                ruang=", ".join(split_names(row.ruangan)) or "-",
             )
         )
 
+    if empty:
+        print("Tidak ada data pengguna.")
+
+
+def find_users(query: str, limit: int = 20, fmt: str = "text") -> None:
+    rows = search_users(reader(), query, limit)
+    if fmt == "json":
+        print_json_rows({"id": row.id, "name": row.name, "email": row.email} for row in rows)
+        return
+
+    if not rows:
+        print("Tidak ada pengguna yang cocok.")
+        return
+    for row in rows:
+        print(f"{row.id}\t{row.name}\t{row.email}")
+
+
+def add_user(name: str, email: str) -> User:
+    if not name or not email:
+        raise CommandError("Nama dan email wajib diisi.")
+    if repository.email_taken(session, email):
+        raise CommandError("Email sudah terdaftar.")
+
+    user = User(name=name, email=email)
+    session.add(user)
+    commit()
+    print(f"Pengguna {name} berhasil dibuat dengan ID {user.id}.")
+    return user
+
 
 def create_user() -> None:
     try:
@@ -39,14 +127,14 @@ def create_user() -> None:
         print("\nInput dibatalkan.")
         return
 
-    if not name or not email:
-        print("Nama dan email wajib diisi.")
-        return
+    add_user(name, email)
 
-    user = User(name=name, email=email)
-    db.session.add(user)
-    db.session.commit()
-    print(f"Pengguna {name} berhasil dibuat dengan ID {user.id}.")
+
+def find_user(user_id: int) -> User:
+    user = session.get(User, user_id)
+    if user is None:
+        raise CommandError("Pengguna tidak ditemukan.")
+    return user
 
 
 def get_user_by_id() -> User | None:
@@ -56,37 +144,57 @@ def get_user_by_id() -> User | None:
         print("Input ID tidak valid atau dibatalkan.")
         return None
 
-    user = User.query.get(user_id)
-    if user is None:
-        print("Pengguna tidak ditemukan.")
-    return user
+    try:
+        return find_user(user_id)
+    except CommandError as exc:
+        print(exc)
+        return None
 
 
-def list_rooms() -> None:
-    rooms = Ruangan.query.order_by(Ruangan.id).all()
-    if not rooms:
-        print("Tidak ada data ruangan.")
-        return
+def list_rooms(limit: int | None = None, offset: int = 0, fmt: str = "text") -> None:
+    rows = repository.room_listing(reader(), limit, offset, STREAM_BATCH_SIZE)
 
-    print("\nDaftar Ruangan:")
-    print("================")
-    for room in rooms:
-        occupancy = (
-            RuanganUser.query.filter_by(ruangan_id=room.id)
-            .join(User, RuanganUser.user_id == User.id)
-            .add_columns(User.name.label("user_name"))
-            .all()
+    if fmt == "json":
+        print_json_rows(
+            {
+                "id": row.id,
+                "name": row.name,
+                "occupant_count": row.occupant_count,
+                "penghuni": split_names(row.penghuni),
+            }
+            for row in rows
         )
-        penghuni = ", ".join(row.user_name for row in occupancy) if occupancy else "-"
+        return
 
+    empty = True
+    for row in rows:
+        if empty:
+            print("\nDaftar Ruangan:")
+            print("================")
+            empty = False
         print(
-            "ID: {id}\nNama Ruangan: {nama}\nPenghuni: {penghuni}\n-".format(
-                id=room.id,
-                nama=room.name,
-                penghuni=penghuni,
+            "ID: {id}\nNama Ruangan: {nama}\nJumlah Penghuni: {jumlah}\nPenghuni: {penghuni}\n-".format(
+                id=row.id,
+                nama=row.name,
+                jumlah=row.occupant_count,
+                penghuni=", ".join(split_names(row.penghuni)) or "-",
             )
         )
 
+    if empty:
+        print("Tidak ada data ruangan.")
+
+
+def add_room(name: str) -> Ruangan:
+    if not name:
+        raise CommandError("Nama ruangan wajib diisi.")
+
+    room = Ruangan(name=name)
+    session.add(room)
+    commit()
+    print(f"Ruangan {name} berhasil dibuat dengan ID {room.id}.")
+    return room
+
 
 def create_room() -> None:
     try:
@@ -95,14 +203,14 @@ def create_room() -> None:
         print("\nInput dibatalkan.")
         return
 
-    if not name:
-        print("Nama ruangan wajib diisi.")
-        return
+    add_room(name)
 
-    room = Ruangan(name=name)
-    db.session.add(room)
-    db.session.commit()
-    print(f"Ruangan {name} berhasil dibuat dengan ID {room.id}.")
+
+def find_room(room_id: int) -> Ruangan:
+    room = session.get(Ruangan, room_id)
+    if room is None:
+        raise CommandError("Ruangan tidak ditemukan.")
+    return room
 
 
 def get_room_by_id() -> Ruangan | None:
@@ -112,10 +220,20 @@ def get_room_by_id() -> Ruangan | None:
         print("Input ID tidak valid atau dibatalkan.")
         return None
 
-    room = Ruangan.query.get(room_id)
-    if room is None:
-        print("Ruangan tidak ditemukan.")
-    return room
+    try:
+        return find_room(room_id)
+    except CommandError as exc:
+        print(exc)
+        return None
+
+
+def edit_room(room: Ruangan, name: str) -> None:
+    if name:
+        room.name = name
+        commit()
+        print("Data ruangan berhasil diperbarui.")
+    else:
+        print("Tidak ada perubahan yang disimpan.")
 
 
 def update_room() -> None:
@@ -129,12 +247,15 @@ def update_room() -> None:
         print("\nInput dibatalkan.")
         return
 
-    if name:
-        room.name = name
-        db.session.commit()
-        print("Data ruangan berhasil diperbarui.")
-    else:
-        print("Tidak ada perubahan yang disimpan.")
+    edit_room(room, name)
+
+
+def remove_room(room_id: int) -> None:
+    # satu DELETE; relasi ruangan ikut terhapus lewat ON DELETE CASCADE
+    if session.execute(delete(Ruangan).where(Ruangan.id == room_id)).rowcount == 0:
+        raise CommandError("Ruangan tidak ditemukan.")
+    commit()
+    print("Ruangan berhasil dihapus.")
 
 
 def delete_room() -> None:
@@ -149,15 +270,20 @@ def delete_room() -> None:
         return
 
     if konfirmasi == "y":
-        # hapus relasi terlebih dahulu
-        RuanganUser.query.filter_by(ruangan_id=room.id).delete()
-        db.session.delete(room)
-        db.session.commit()
-        print("Ruangan berhasil dihapus.")
+        remove_room(room.id)
     else:
         print("Penghapusan dibatalkan.")
 
 
+def place_user(user: User, room: Ruangan) -> None:
+    if RuanganUser.create_if_absent(session, user.id, room.id) is None:
+        print("Pengguna sudah terdaftar di ruangan tersebut.")
+        return
+
+    commit()
+    print(f"Pengguna {user.name} berhasil ditempatkan di {room.name}.")
+
+
 def assign_user_to_room() -> None:
     user = get_user_by_id()
     if user is None:
@@ -167,15 +293,17 @@ def assign_user_to_room() -> None:
     if room is None:
         return
 
-    existing = RuanganUser.query.filter_by(user_id=user.id, ruangan_id=room.id).first()
-    if existing:
-        print("Pengguna sudah terdaftar di ruangan tersebut.")
-        return
+    place_user(user, room)
 
-    assignment = RuanganUser(user_id=user.id, ruangan_id=room.id)
-    db.session.add(assignment)
-    db.session.commit()
-    print(f"Pengguna {user.name} berhasil ditempatkan di {room.name}.")
+
+def unplace_user(user: User, room: Ruangan) -> None:
+    assignment = repository.find_assignment(session, user.id, room.id)
+    if assignment is None:
+        raise CommandError("Relasi pengguna-ruangan tidak ditemukan.")
+
+    session.delete(assignment)
+    commit()
+    print("Relasi berhasil dihapus.")
 
 
 def remove_assignment() -> None:
@@ -187,37 +315,51 @@ def remove_assignment() -> None:
     if room is None:
         return
 
-    assignment = RuanganUser.query.filter_by(user_id=user.id, ruangan_id=room.id).first()
-    if assignment is None:
-        print("Relasi pengguna-ruangan tidak ditemukan.")
-        return
-
-    db.session.delete(assignment)
-    db.session.commit()
-    print("Relasi berhasil dihapus.")
+    unplace_user(user, room)
 
 
-def list_assignments() -> None:
-    assignments = (
-        RuanganUser.query
-        .join(User, RuanganUser.user_id == User.id)
-        .join(Ruangan, RuanganUser.ruangan_id == Ruangan.id)
-        .add_columns(User.name.label('user_name'), Ruangan.name.label('ruangan_name'), RuanganUser.id.label('assignment_id'))
-        .order_by(RuanganUser.id)
-        .all()
-    )
+def list_assignments(limit: int | None = None, offset: int = 0, fmt: str = "text") -> None:
+    rows = repository.assignment_listing(reader(), limit, offset, STREAM_BATCH_SIZE)
 
-    if not assignments:
-        print("Belum ada relasi pengguna-ruangan.")
+    if fmt == "json":
+        print_json_rows(
+            {
+                "id": row.assignment_id,
+                "user_id": row.user_id,
+                "user_name": row.user_name,
+                "ruangan_id": row.ruangan_id,
+                "ruangan_name": row.ruangan_name,
+            }
+            for row in rows
+        )
         return
 
-    print("\nDaftar Relasi Pengguna-Ruangan:")
-    print("==============================")
-    for row in assignments:
+    empty = True
+    for row in rows:
+        if empty:
+            print("\nDaftar Relasi Pengguna-Ruangan:")
+            print("==============================")
+            empty = False
         print(
             f"ID Relasi: {row.assignment_id}\nPengguna: {row.user_name}\nRuangan: {row.ruangan_name}\n-"
         )
 
+    if empty:
+        print("Belum ada relasi pengguna-ruangan.")
+
+
+def edit_user(user: User, name: str, email: str) -> None:
+    if email and email != user.email and repository.email_taken(session, email):
+        raise CommandError("Email sudah terdaftar.")
+
+    if name:
+        user.name = name
+    if email:
+        user.email = email
+
+    commit()
+    print("Data pengguna berhasil diperbarui.")
+
 
 def update_user() -> None:
     user = get_user_by_id()
@@ -231,13 +373,14 @@ def update_user() -> None:
         print("\nInput dibatalkan.")
         return
 
-    if name:
-        user.name = name
-    if email:
-        user.email = email
+    edit_user(user, name, email)
 
-    db.session.commit()
-    print("Data pengguna berhasil diperbarui.")
+
+def remove_user(user_id: int) -> None:
+    if session.execute(delete(User).where(User.id == user_id)).rowcount == 0:
+        raise CommandError("Pengguna tidak ditemukan.")
+    commit()
+    print("Pengguna berhasil dihapus.")
 
 
 def delete_user() -> None:
@@ -252,13 +395,64 @@ def delete_user() -> None:
         return
 
     if konfirmasi == "y":
-        db.session.delete(user)
-        db.session.commit()
-        print("Pengguna berhasil dihapus.")
+        remove_user(user.id)
     else:
         print("Penghapusan dibatalkan.")
 
 
+def run_import(path: str, kind: str, fmt: str | None = None) -> None:
+    import importer
+
+    if kind not in importer.KINDS:
+        raise CommandError("Jenis data tidak valid.")
+
+    stats = importer.ImportStats(kind=kind)
+    try:
+        with open(path, newline="", encoding="utf-8") as stream:
+            records = importer.iter_records(stream, fmt or importer.detect_format(path))
+            importer.import_records(session, records, kind, autocommit=not _batch_mode, stats=stats)
+    except OSError as exc:
+        raise CommandError(f"File tidak dapat dibaca: {exc}") from exc
+    except ValueError as exc:
+        raise CommandError(f"Data tidak valid: {exc} ({stats.committed} baris sudah tersimpan)") from exc
+
+    print(
+        f"Impor {kind} selesai: {stats.inserted} dimasukkan, {stats.duplicates} duplikat, "
+        f"{stats.invalid} tidak valid dari {stats.read} baris "
+        f"dalam {stats.elapsed:.2f} detik ({stats.rows_per_second:,.0f} baris/detik)."
+    )
+
+
+def run_export(kind: str, fmt: str, output: str | None, compress: bool) -> None:
+    import exporter
+
+    chunks = exporter.iter_export(reader(), kind, fmt)
+    try:
+        stream = open(output, "wb") if output else sys.stdout.buffer
+    except OSError as exc:
+        raise CommandError(f"File tidak dapat ditulis: {exc}") from exc
+    try:
+        data = exporter.gzip_chunks(chunks) if compress else (chunk.encode("utf-8") for chunk in chunks)
+        for block in data:
+            stream.write(block)
+    finally:
+        if output:
+            stream.close()
+        else:
+            stream.flush()
+
+
+def import_data() -> None:
+    try:
+        path = input("Path file CSV/NDJSON: ").strip()
+        kind = input("Jenis data (users/rooms/assignments): ").strip().lower()
+    except (EOFError, KeyboardInterrupt):
+        print("\nInput dibatalkan.")
+        return
+
+    run_import(path, kind)
+
+
 def menu() -> None:
     actions: dict[str, Callable[[], None]] = {
         "1": list_users,
@@ -272,6 +466,7 @@ def menu() -> None:
         "9": assign_user_to_room,
         "10": remove_assignment,
         "11": list_assignments,
+        "12": import_data,
         "0": exit_program,
     }
 
@@ -289,12 +484,16 @@ def menu() -> None:
             "9. Tempatkan pengguna ke ruangan\n"
             "10. Hapus relasi pengguna-ruangan\n"
             "11. Lihat semua relasi\n"
+            "12. Impor data massal (CSV/NDJSON)\n"
             "0. Keluar"
         )
         choice = input("Pilih menu: ").strip()
         action = actions.get(choice)
         if action:
-            action()
+            try:
+                action()
+            except CommandError as exc:
+                print(exc)
         else:
             print("Pilihan tidak valid. Coba lagi.")
 
@@ -304,9 +503,128 @@ def exit_program() -> None:
     sys.exit(0)
 
 
+def run_batch(stream: TextIO) -> None:
+    """Jalankan banyak perintah (satu per baris) dalam satu proses dan satu transaksi.
+
+    Baris kosong dan baris yang diawali ``#`` dilewati. Bila satu perintah
+    gagal, seluruh transaksi dibatalkan.
+    """
+    parser = build_parser()
+    executed = 0
+    with batch_transaction():
+        for line_number, line in enumerate(stream, start=1):
+            words = shlex.split(line, comments=True)
+            if not words:
+                continue
+            try:
+                args = parser.parse_args(words)
+            except SystemExit as exc:
+                raise CommandError(f"Baris {line_number}: perintah tidak valid.") from exc
+            if args.resource in (None, "batch"):
+                raise CommandError(f"Baris {line_number}: perintah tidak valid di mode batch.")
+            try:
+                args.handler(args)
+            except CommandError as exc:
+                raise CommandError(f"Baris {line_number}: {exc}") from exc
+            executed += 1
+    print(f"{executed} perintah dijalankan dalam satu transaksi.")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="CLI manajemen pengguna dan ruangan. Tanpa argumen, menu interaktif dijalankan."
+    )
+    resources = parser.add_subparsers(dest="resource")
+
+    def add_listing(actions, handler: Callable[..., None], help_text: str) -> None:
+        listing = actions.add_parser("list", help=help_text)
+        listing.add_argument("--limit", type=int, default=None, help="Jumlah maksimum baris")
+        listing.add_argument("--offset", type=int, default=0, help="Lewati sejumlah baris pertama")
+        listing.add_argument("--format", choices=("text", "json"), default="text", help="Format keluaran")
+        listing.set_defaults(handler=lambda args: handler(limit=args.limit, offset=args.offset, fmt=args.format))
+
+    users = resources.add_parser("users", help="Kelola pengguna").add_subparsers(dest="action", required=True)
+    add_listing(users, list_users, "Tampilkan pengguna beserta ruangannya")
+    command = users.add_parser("search", help="Cari pengguna berdasarkan awalan nama/email")
+    command.add_argument("query")
+    command.add_argument("--limit", type=int, default=20, help="Jumlah maksimum hasil")
+    command.add_argument("--format", choices=("text", "json"), default="text", help="Format keluaran")
+    command.set_defaults(handler=lambda args: find_users(args.query, args.limit, args.format))
+    command = users.add_parser("create", help="Tambah pengguna baru")
+    command.add_argument("--name", required=True)
+    command.add_argument("--email", required=True)
+    command.set_defaults(handler=lambda args: add_user(args.name.strip(), args.email.strip()))
+    command = users.add_parser("update", help="Ubah pengguna")
+    command.add_argument("--id", type=int, required=True)
+    command.add_argument("--name", default="")
+    command.add_argument("--email", default="")
+    command.set_defaults(handler=lambda args: edit_user(find_user(args.id), args.name.strip(), args.email.strip()))
+    command = users.add_parser("delete", help="Hapus pengguna")
+    command.add_argument("--id", type=int, required=True)
+    command.set_defaults(handler=lambda args: remove_user(args.id))
+
+    rooms = resources.add_parser("rooms", help="Kelola ruangan").add_subparsers(dest="action", required=True)
+    add_listing(rooms, list_rooms, "Tampilkan ruangan beserta penghuninya")
+    command = rooms.add_parser("create", help="Tambah ruangan baru")
+    command.add_argument("--name", required=True)
+    command.set_defaults(handler=lambda args: add_room(args.name.strip()))
+    command = rooms.add_parser("update", help="Ubah ruangan")
+    command.add_argument("--id", type=int, required=True)
+    command.add_argument("--name", default="")
+    command.set_defaults(handler=lambda args: edit_room(find_room(args.id), args.name.strip()))
+    command = rooms.add_parser("delete", help="Hapus ruangan")
+    command.add_argument("--id", type=int, required=True)
+    command.set_defaults(handler=lambda args: remove_room(args.id))
+
+    assignments = resources.add_parser("assignments", help="Lihat relasi pengguna-ruangan").add_subparsers(
+        dest="action", required=True
+    )
+    add_listing(assignments, list_assignments, "Tampilkan semua relasi")
+
+    command = resources.add_parser("assign", help="Tempatkan pengguna ke ruangan")
+    command.add_argument("--user", type=int, required=True)
+    command.add_argument("--room", type=int, required=True)
+    command.set_defaults(handler=lambda args: place_user(find_user(args.user), find_room(args.room)))
+
+    command = resources.add_parser("unassign", help="Hapus relasi pengguna-ruangan")
+    command.add_argument("--user", type=int, required=True)
+    command.add_argument("--room", type=int, required=True)
+    command.set_defaults(handler=lambda args: unplace_user(find_user(args.user), find_room(args.room)))
+
+    command = resources.add_parser("import", help="Impor data massal dari CSV/NDJSON")
+    command.add_argument("kind", choices=("users", "rooms", "assignments"))
+    command.add_argument("file")
+    command.add_argument("--format", choices=("csv", "ndjson"), default=None)
+    command.set_defaults(handler=lambda args: run_import(args.file, args.kind, args.format))
+
+    command = resources.add_parser("export", help="Ekspor tabel sebagai CSV/NDJSON secara streaming")
+    command.add_argument("kind", choices=("users", "rooms", "assignments"))
+    command.add_argument("--format", choices=("csv", "ndjson"), default="ndjson")
+    command.add_argument("--output", "-o", default=None, help="File tujuan (bawaan: stdout)")
+    command.add_argument("--gzip", action="store_true", help="Kompres keluaran dengan gzip")
+    command.set_defaults(handler=lambda args: run_export(args.kind, args.format, args.output, args.gzip))
+
+    command = resources.add_parser("batch", help="Jalankan banyak perintah dari file/stdin dalam satu transaksi")
+    command.add_argument("file", nargs="?", type=argparse.FileType("r", encoding="utf-8"), default=sys.stdin)
+    command.set_defaults(handler=lambda args: run_batch(args.file))
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    if args.resource is None:
+        menu()
+        return
+    try:
+        args.handler(args)
+    except CommandError as exc:
+        print(exc, file=sys.stderr)
+        sys.exit(1)
+
+
 if __name__ == "__main__":
     try:
-        menu()
+        main()
     except KeyboardInterrupt:
         print("\nAplikasi dihentikan.")
         sys.exit(0)
@@ -0,0 +1,358 @@
+"""Inti akses data yang hanya bergantung pada SQLAlchemy.
+
+Model, engine, dan session didefinisikan di sini agar CLI, importer, dan
+eksporter dapat dipakai tanpa memuat Flask. ``app.py`` membungkus modul ini
+untuk aplikasi web dan migrasi. Engine baru dibuat saat pertama kali dipakai.
+"""
+from __future__ import annotations
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, create_engine, event, func, select, text, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert  # INSERT ... ON CONFLICT khusus SQLite
+from sqlalchemy.engine import Engine, Row, make_url
+from sqlalchemy.orm import DeclarativeBase, Session, relationship, scoped_session
+from sqlalchemy.pool import QueuePool
+
+BASE_DIR = Path(__file__).resolve().parent
+# bawaan berupa path absolut agar web dan CLI selalu membuka file yang sama, dari direktori mana pun
+DATABASE_URI = os.environ.get("DATABASE_URL") or f"sqlite:///{BASE_DIR / 'db.sqlite3'}"
+
+# profil PRAGMA SQLite yang dijalankan di setiap koneksi baru
+PRAGMA_PROFILES: dict[str, dict[str, object]] = {
+    # perilaku bawaan SQLite: rollback journal, synchronous=FULL, cache kecil, tanpa mmap
+    "default": {},
+    # pembaca tidak menunggu penulis, dan commit tidak lagi memanggil fsync setiap kali
+    "wal": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -65536,  # dalam KiB (64 MiB)
+        "mmap_size": 268435456,  # 256 MiB
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,  # milidetik
+    },
+    # impor massal sekali jalan: tanpa fsync sama sekali, transaksi terakhir bisa hilang bila listrik padam
+    "bulk": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -262144,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+        "busy_timeout": 30000,
+    },
+}
+PRAGMA_PROFILE = os.environ.get("SQLITE_PRAGMA_PROFILE", "wal")
+
+# pemisahan baca/tulis: query baca lewat engine read-only (mode=ro) berpool sendiri,
+# semua perubahan lewat engine penulis dengan satu koneksi
+SPLIT_READS = os.environ.get("DATABASE_SPLIT_READS", "0") == "1"
+READ_POOL_SIZE = int(os.environ.get("DATABASE_READ_POOL_SIZE", "5"))
+
+# kata pencarian terpendek; awalan 1 huruf tidak punya indeks awalan di user_fts (prefix='2 3 4 5 6')
+SEARCH_MIN_PREFIX = 2
+# batas kecocokan yang masih diberi peringkat bm25; di atasnya pencarian dianggap terlalu umum
+SEARCH_RANK_LIMIT = 1000
+
+_engine: Engine | None = None
+_read_engine: Engine | None = None
+
+
+class PoolStats:
+    """Statistik antre koneksi satu pool: jumlah checkout dan lama menunggu koneksi bebas."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.waiting = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, waited: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+    def as_dict(self) -> dict[str, object]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "waiting": self.waiting,
+                "wait_total_ms": round(self.wait_total * 1000, 3),
+                "wait_avg_ms": round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+            }
+
+
+# statistik per nama pool ("writer"/"reader"), dipakai bersama oleh engine inti dan Flask-SQLAlchemy
+POOL_STATS: dict[str, PoolStats] = {"writer": PoolStats(), "reader": PoolStats()}
+
+
+class TimedQueuePool(QueuePool):
+    """``QueuePool`` yang mencatat lama menunggu koneksi ke ``POOL_STATS[role]``.
+
+    ``create_engine`` hanya meneruskan argumen pool yang dikenalnya, jadi peran
+    dibawa oleh kelasnya sendiri: pakai :meth:`for_role` sebagai ``poolclass``.
+    """
+
+    role = "writer"
+    _subclasses: dict[str, type[TimedQueuePool]] = {}
+
+    @classmethod
+    def for_role(cls, role: str) -> type[TimedQueuePool]:
+        if role not in cls._subclasses:
+            cls._subclasses[role] = type(f"{cls.__name__}[{role}]", (cls,), {"role": role})
+        return cls._subclasses[role]
+
+    def _do_get(self):
+        stats = POOL_STATS.setdefault(self.role, PoolStats())
+        with stats._lock:
+            stats.waiting += 1
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            with stats._lock:
+                stats.waiting -= 1
+            stats.record(time.perf_counter() - started)
+
+
+def read_only_uri(uri: str) -> str:
+    """Ubah URI SQLite berkas menjadi URI ``file:...?mode=ro`` untuk koneksi read-only."""
+    return f"sqlite:///file:{make_url(uri).database}?mode=ro&uri=true"
+
+
+def can_split_reads(uri: str) -> bool:
+    url = make_url(uri)
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+
+def engine_options(uri: str, role: str, split: bool = SPLIT_READS, read_pool_size: int = READ_POOL_SIZE) -> dict:
+    """Argumen ``create_engine`` untuk peran ``"writer"`` atau ``"reader"`` (tanpa ``url``)."""
+    if not can_split_reads(uri):
+        return {}
+    options: dict[str, object] = {"poolclass": TimedQueuePool.for_role(role), "pool_logging_name": role}
+    if role == "reader":
+        options.update(pool_size=read_pool_size, max_overflow=0)
+    elif split:
+        # satu koneksi penulis: penulis mengantre di pool, bukan saling berebut kunci SQLite
+        options.update(pool_size=1, max_overflow=0)
+    return options
+
+
+def pool_stats() -> dict[str, dict[str, object]]:
+    return {name: stats.as_dict() for name, stats in POOL_STATS.items()}
+
+
+@event.listens_for(Engine, "connect")
+def enable_foreign_keys(dbapi_connection, connection_record) -> None:
+    """Aktifkan penegakan foreign key (dan ON DELETE CASCADE) di setiap koneksi SQLite."""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+def apply_pragma_profile(engine: Engine, profile: str = PRAGMA_PROFILE, read_only: bool = False) -> Engine:
+    """Jalankan PRAGMA profil ``profile`` di setiap koneksi baru ``engine`` (hanya SQLite).
+
+    Koneksi read-only tidak boleh mengubah ``journal_mode``, jadi PRAGMA itu dilewati.
+    """
+    if profile not in PRAGMA_PROFILES:
+        raise ValueError(f"Profil PRAGMA tidak dikenal: {profile} (pilihan: {', '.join(PRAGMA_PROFILES)})")
+    if engine.dialect.name != "sqlite":
+        return engine
+    pragmas = {
+        name: value
+        for name, value in PRAGMA_PROFILES[profile].items()
+        if not (read_only and name == "journal_mode")
+    }
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return engine
+
+
+def get_engine() -> Engine:
+    """Kembalikan engine bersama (penulis), dibuat saat pertama kali dibutuhkan."""
+    global _engine
+    if _engine is None:
+        _engine = apply_pragma_profile(create_engine(DATABASE_URI, **engine_options(DATABASE_URI, "writer")))
+    return _engine
+
+
+def get_read_engine() -> Engine:
+    """Engine read-only bila ``SPLIT_READS`` aktif; selain itu sama dengan ``get_engine()``."""
+    global _read_engine
+    if not (SPLIT_READS and can_split_reads(DATABASE_URI)):
+        return get_engine()
+    if _read_engine is None:
+        uri = read_only_uri(DATABASE_URI)
+        _read_engine = apply_pragma_profile(create_engine(uri, **engine_options(uri, "reader")), read_only=True)
+    return _read_engine
+
+
+# session per thread; pembuatan engine ditunda sampai session pertama dibuka
+session: scoped_session[Session] = scoped_session(lambda: Session(bind=get_engine()))
+# session khusus baca untuk daftar dan pencarian
+read_session: scoped_session[Session] = scoped_session(lambda: Session(bind=get_read_engine()))
+
+
+class Base(DeclarativeBase):
+    """Kelas dasar deklaratif untuk seluruh model."""
+
+
+class User(Base):
+    """Model tabel user dengan kolom id, name, dan email."""
+
+    __tablename__ = 'user'
+
+    id = Column(Integer, primary_key=True)  # primary key unik pengguna
+    name = Column(String(50), nullable=False)  # nama pengguna maksimal 50 karakter
+    email = Column(String(50), nullable=False)  # email pengguna maksimal 50 karakter
+
+    # relasi dihapus oleh database (ON DELETE CASCADE), bukan dimuat lalu dihapus oleh ORM
+    assignments = relationship('RuanganUser', cascade='all, delete-orphan', passive_deletes=True)
+
+    # indeks unik agar pencarian berdasarkan email tidak memindai seluruh tabel
+    __table_args__ = (Index('ix_user_email', 'email', unique=True),)
+
+
+class Ruangan(Base):
+    """Model tabel ruangan dengan kolom id dan name."""
+
+    __tablename__ = 'ruangan'
+
+    id = Column(Integer, primary_key=True)  # primary key ruang
+    name = Column(String(50))  # nama ruangan
+    # jumlah penghuni yang dipelihara trigger SQLite pada ruangan_user; lihat reconcile_occupant_counts
+    occupant_count = Column(Integer, nullable=False, default=0, server_default='0')
+
+    assignments = relationship('RuanganUser', cascade='all, delete-orphan', passive_deletes=True)
+
+
+class RuanganUser(Base):
+    """Tabel relasi banyak-ke-banyak antara user dan ruangan."""
+
+    __tablename__ = 'ruangan_user'
+
+    id = Column(Integer, primary_key=True)  # primary key relasi
+    user_id = Column(Integer, ForeignKey('user.id', ondelete='CASCADE'))  # referensi ke user
+    ruangan_id = Column(Integer, ForeignKey('ruangan.id', ondelete='CASCADE'))  # referensi ke ruangan
+
+    # pasangan (user_id, ruangan_id) unik; indeks ini juga dipakai untuk filter user_id saja
+    __table_args__ = (
+        Index('ix_ruangan_user_user_id_ruangan_id', 'user_id', 'ruangan_id', unique=True),
+        Index('ix_ruangan_user_ruangan_id', 'ruangan_id'),
+    )
+
+    @classmethod
+    def create_if_absent(cls, session: Session, user_id: int, ruangan_id: int) -> int | None:
+        """Buat relasi dengan satu pernyataan ``INSERT ... ON CONFLICT DO NOTHING RETURNING``.
+
+        Mengembalikan id relasi baru, atau ``None`` bila pasangan tersebut
+        sudah ada. Aman dipanggil bersamaan karena bergantung pada indeks unik
+        ``(user_id, ruangan_id)``; pemanggil tetap bertanggung jawab atas commit.
+        """
+        statement = (
+            sqlite_insert(cls)
+            .values(user_id=user_id, ruangan_id=ruangan_id)
+            .on_conflict_do_nothing(index_elements=['user_id', 'ruangan_id'])
+            .returning(cls.id)
+        )
+        return session.execute(statement).scalar()
+
+
+def reconcile_occupant_counts(session: Session) -> int:
+    """Hitung ulang ``ruangan.occupant_count`` dari ``ruangan_user``.
+
+    Hanya ruangan yang nilainya meleset yang diperbarui; jumlahnya dikembalikan.
+    Pemanggil bertanggung jawab atas commit.
+    """
+    actual = (
+        select(func.count(RuanganUser.id)).where(RuanganUser.ruangan_id == Ruangan.id).scalar_subquery()
+    )
+    statement = (
+        update(Ruangan)
+        .where(Ruangan.occupant_count != actual)
+        .values(occupant_count=actual)
+        .execution_options(synchronize_session=False)
+    )
+    return session.execute(statement).rowcount
+
+
+def fts_query(value: str, prefix: bool = True) -> str | None:
+    """Ubah masukan bebas menjadi query FTS5 awalan, mis. ``bud exa`` -> ``"bud"* "exa"*``.
+
+    Setiap kata dikutip agar operator FTS5 (``AND``, ``NEAR``, ``-``) di masukan
+    pengguna tidak ditafsirkan; kata yang lebih pendek dari ``SEARCH_MIN_PREFIX``
+    diabaikan. Mengembalikan ``None`` bila tidak ada kata.
+    """
+    tokens = [token for token in re.findall(r"\w+", value) if len(token) >= SEARCH_MIN_PREFIX]
+    star = "*" if prefix else ""
+    return " ".join(f'"{token}"{star}' for token in tokens) or None
+
+
+def search_users(session: Session, query: str, limit: int = 20) -> list[Row]:
+    """Cari pengguna lewat indeks FTS5 ``user_fts``; kecocokan nama diberi bobot lebih dari email.
+
+    Peringkat bm25 hanya dihitung bila kecocokan paling banyak
+    ``SEARCH_RANK_LIMIT``. Untuk awalan yang lebih umum, kecocokan kata utuh
+    (mis. ``Budi`` di antara ribuan ``Budiman``) diberi peringkat lebih dulu,
+    lalu sisanya diisi kecocokan awalan urut id tanpa peringkat. Bila kata
+    utuhnya pun umum, hasilnya kecocokan kata utuh urut id saja.
+    """
+    match = fts_query(query)
+    if match is None:
+        return []
+    # kata utuh dibaca langsung dari doclist-nya; awalan lebih panjang dari indeks awalan
+    # harus menggabungkan seluruh doclist lebih dulu, jadi periksa kata utuh dulu
+    exact = fts_query(query, prefix=False)
+    if not _fts_selective(session, exact):
+        return _fts_unranked(session, exact, limit)
+    if _fts_selective(session, match):
+        return _fts_ranked(session, match, limit)
+
+    rows = _fts_ranked(session, exact, limit)
+    seen = {row.id for row in rows}
+    for row in _fts_unranked(session, match, limit):
+        if len(rows) == limit:
+            break
+        if row.id not in seen:
+            rows.append(row)
+    return rows
+
+
+def _fts_selective(session: Session, match: str) -> bool:
+    # berhenti membaca doclist setelah SEARCH_RANK_LIMIT + 1 kecocokan
+    statement = text("SELECT count(*) FROM (SELECT 1 FROM user_fts WHERE user_fts MATCH :match LIMIT :cap)")
+    return session.execute(statement, {"match": match, "cap": SEARCH_RANK_LIMIT + 1}).scalar() <= SEARCH_RANK_LIMIT
+
+
+def _fts_unranked(session: Session, match: str, limit: int) -> list[Row]:
+    statement = text(
+        "SELECT user.id, user.name, user.email FROM user_fts JOIN user ON user.id = user_fts.rowid "
+        "WHERE user_fts MATCH :match ORDER BY user_fts.rowid LIMIT :limit"
+    )
+    return list(session.execute(statement, {"match": match, "limit": limit}))
+
+
+def _fts_ranked(session: Session, match: str, limit: int) -> list[Row]:
+    statement = text(
+        "SELECT user.id, user.name, user.email "
+        "FROM (SELECT rowid, bm25(user_fts, 10.0, 1.0) AS score FROM user_fts "
+        "      WHERE user_fts MATCH :match ORDER BY score, rowid LIMIT :limit) AS hit "
+        "JOIN user ON user.id = hit.rowid "
+        "ORDER BY hit.score, user.id"
+    )
+    return list(session.execute(statement, {"match": match, "limit": limit}))
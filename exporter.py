@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zlib
+from typing import Iterator
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from core import Ruangan, RuanganUser, User
+
+TABLES = {"users": User, "rooms": Ruangan, "assignments": RuanganUser}
+FORMATS = ("csv", "ndjson")
+
+
+def iter_rows(session: Session, kind: str, batch_size: int = 5_000) -> Iterator[dict[str, object]]:
+    """Baca seluruh baris tabel berurutan id dengan kursor ``yield_per``."""
+    table = TABLES[kind].__table__
+    result = session.execute(
+        select(table).order_by(table.c.id).execution_options(yield_per=batch_size)
+    )
+    for row in result.mappings():
+        yield dict(row)
+
+
+def iter_export(session: Session, kind: str, fmt: str, batch_size: int = 5_000) -> Iterator[str]:
+    """Hasilkan isi ekspor CSV/NDJSON per potongan ``batch_size`` baris."""
+    if kind not in TABLES:
+        raise ValueError(f"Jenis data tidak dikenal: {kind}")
+    if fmt not in FORMATS:
+        raise ValueError(f"Format tidak dikenal: {fmt}")
+
+    columns = [column.name for column in TABLES[kind].__table__.columns]
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns) if fmt == "csv" else None
+    if writer is not None:
+        writer.writeheader()
+
+    for count, row in enumerate(iter_rows(session, kind, batch_size), start=1):
+        if writer is not None:
+            writer.writerow(row)
+        else:
+            buffer.write(json.dumps(row, ensure_ascii=False))
+            buffer.write("\n")
+        if count % batch_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def gzip_chunks(chunks: Iterator[str], level: int = 6) -> Iterator[bytes]:
+    """Kompres aliran teks menjadi gzip secara bertahap."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
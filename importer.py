@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import csv
+import json
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Iterable, Iterator, TextIO
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from core import Ruangan, RuanganUser, User
+
+KINDS = ("users", "rooms", "assignments")
+FORMATS = ("csv", "ndjson")
+
+
+@dataclass
+class ImportStats:
+    """Ringkasan hasil impor massal."""
+
+    kind: str
+    read: int = 0
+    inserted: int = 0
+    committed: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    commits: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.read / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "kind": self.kind,
+            "read": self.read,
+            "inserted": self.inserted,
+            "committed": self.committed,
+            "duplicates": self.duplicates,
+            "invalid": self.invalid,
+            "commits": self.commits,
+            "elapsed": round(self.elapsed, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+
+def detect_format(filename: str) -> str:
+    return "ndjson" if filename.lower().endswith((".ndjson", ".jsonl", ".json")) else "csv"
+
+
+def iter_records(stream: TextIO, fmt: str) -> Iterator[dict[str, object]]:
+    """Baca baris CSV (dengan header) atau NDJSON satu per satu tanpa memuat seluruh file."""
+    if fmt == "csv":
+        try:
+            yield from csv.DictReader(stream)
+        except csv.Error as exc:
+            raise ValueError(str(exc)) from exc
+    elif fmt == "ndjson":
+        for number, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"baris {number}: {exc}") from exc
+            if not isinstance(record, dict):
+                raise ValueError(f"baris {number}: harus berupa objek JSON")
+            yield record
+    else:
+        raise ValueError(f"Format tidak dikenal: {fmt}")
+
+
+def chunked(records: Iterable[dict[str, object]], size: int) -> Iterator[list[dict[str, object]]]:
+    iterator = iter(records)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def clean(value: object) -> str:
+    return str(value).strip() if value is not None else ""
+
+
+def as_int(value: object) -> int | None:
+    try:
+        return int(value) if clean(value) else None
+    except (TypeError, ValueError):
+        return None
+
+
+def import_records(
+    session: Session,
+    records: Iterable[dict[str, object]],
+    kind: str,
+    chunk_size: int = 5_000,
+    transaction_rows: int = 50_000,
+    autocommit: bool = True,
+    stats: ImportStats | None = None,
+) -> ImportStats:
+    """Masukkan rekaman per potongan ``chunk_size`` dengan ``executemany``.
+
+    Transaksi di-commit setiap ``transaction_rows`` baris yang dimasukkan agar
+    kunci tulis SQLite tidak ditahan sepanjang impor. Dengan
+    ``autocommit=False`` commit dan rollback diserahkan ke pemanggil. Berikan
+    ``stats`` sendiri untuk mengetahui ``committed`` bila impor gagal di tengah.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Jenis data tidak dikenal: {kind}")
+
+    stats = stats or ImportStats(kind=kind)
+    prepare = {"users": _prepare_users, "rooms": _prepare_rooms, "assignments": _prepare_assignments}[kind]
+    table = {"users": User, "rooms": Ruangan, "assignments": RuanganUser}[kind].__table__
+    seen: set[object] = set()
+    uncommitted = 0
+
+    try:
+        for chunk in chunked(records, chunk_size):
+            stats.read += len(chunk)
+            rows = prepare(session, chunk, seen, stats)
+            if rows:
+                session.execute(insert(table), rows)
+                stats.inserted += len(rows)
+                uncommitted += len(rows)
+            if autocommit and uncommitted >= transaction_rows:
+                session.commit()
+                stats.commits += 1
+                stats.committed = stats.inserted
+                uncommitted = 0
+        if autocommit:
+            session.commit()
+            stats.commits += 1
+            stats.committed = stats.inserted
+    except Exception:
+        if autocommit:
+            session.rollback()
+        raise
+    finally:
+        stats.elapsed = time.perf_counter() - stats.started_at
+    return stats
+
+
+def _prepare_users(
+    session: Session, chunk: list[dict[str, object]], seen: set[object], stats: ImportStats
+) -> list[dict[str, object]]:
+    candidates = []
+    for record in chunk:
+        name, email = clean(record.get("name")), clean(record.get("email"))
+        if not name or not email:
+            stats.invalid += 1
+        elif email in seen:
+            stats.duplicates += 1
+        else:
+            seen.add(email)
+            candidates.append({"name": name, "email": email})
+
+    # satu query IN per potongan untuk email yang sudah ada di database
+    existing = {
+        email
+        for (email,) in session.query(User.email).filter(User.email.in_([row["email"] for row in candidates]))
+    }
+    stats.duplicates += sum(1 for row in candidates if row["email"] in existing)
+    return [row for row in candidates if row["email"] not in existing]
+
+
+def _prepare_rooms(
+    session: Session, chunk: list[dict[str, object]], seen: set[object], stats: ImportStats
+) -> list[dict[str, object]]:
+    rows = []
+    for record in chunk:
+        name = clean(record.get("name"))
+        if name:
+            rows.append({"name": name})
+        else:
+            stats.invalid += 1
+    return rows
+
+
+def _prepare_assignments(
+    session: Session, chunk: list[dict[str, object]], seen: set[object], stats: ImportStats
+) -> list[dict[str, object]]:
+    """Relasi dapat merujuk ``user_id``/``ruangan_id`` atau ``user_email``/``ruangan_name``."""
+    emails = {clean(record.get("user_email")) for record in chunk if as_int(record.get("user_id")) is None}
+    room_names = {clean(record.get("ruangan_name")) for record in chunk if as_int(record.get("ruangan_id")) is None}
+    user_by_email = dict(
+        session.query(User.email, func.min(User.id)).filter(User.email.in_(emails)).group_by(User.email)
+    )
+    room_by_name = dict(
+        session.query(Ruangan.name, func.min(Ruangan.id)).filter(Ruangan.name.in_(room_names)).group_by(Ruangan.name)
+    )
+
+    resolved = []
+    for record in chunk:
+        user_id = as_int(record.get("user_id")) or user_by_email.get(clean(record.get("user_email")))
+        room_id = as_int(record.get("ruangan_id")) or room_by_name.get(clean(record.get("ruangan_name")))
+        if user_id is None or room_id is None:
+            stats.invalid += 1
+        else:
+            resolved.append((user_id, room_id))
+
+    user_ids = {user_id for user_id, _ in resolved}
+    room_ids = {room_id for _, room_id in resolved}
+    known_users = {user_id for (user_id,) in session.query(User.id).filter(User.id.in_(user_ids))}
+    known_rooms = {room_id for (room_id,) in session.query(Ruangan.id).filter(Ruangan.id.in_(room_ids))}
+    existing = set(
+        session.query(RuanganUser.user_id, RuanganUser.ruangan_id).filter(RuanganUser.user_id.in_(user_ids))
+    )
+
+    rows = []
+    for pair in resolved:
+        if pair[0] not in known_users or pair[1] not in known_rooms:
+            stats.invalid += 1
+        elif pair in existing or pair in seen:
+            stats.duplicates += 1
+        else:
+            seen.add(pair)
+            rows.append({"user_id": pair[0], "ruangan_id": pair[1]})
+    return rows
@@ -0,0 +1,113 @@
+"""Jalankan migrasi database tanpa membangun aplikasi Flask.
+
+Ditujukan untuk langkah start-up container::
+
+    python migrate.py                    # upgrade ke head
+    python migrate.py upgrade <revisi>
+    python migrate.py current
+    python migrate.py estimate           # perkiraan lama, tanpa menulis ke database
+
+URL database dan metadata diambil dari ``core`` (lihat ``migrations/env.py``),
+jadi Flask, Flask-SQLAlchemy, dan ``web.py`` tidak pernah dimuat. Header setiap
+file revisi dibaca sebagai teks untuk menentukan head; bila database sudah di
+head, Alembic dan modul revisi tidak dimuat sama sekali.
+"""
+from __future__ import annotations
+
+import argparse
+import ast
+import re
+from pathlib import Path
+
+from sqlalchemy import Engine, inspect, text
+
+from core import get_engine
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent / "migrations"
+
+_HEADER = re.compile(r"^(revision|down_revision)\s*=\s*(.+)$", re.MULTILINE)
+
+
+def read_revisions(versions_dir: Path = MIGRATIONS_DIR / "versions") -> dict[str, tuple[str, ...]]:
+    """Peta revisi -> revisi induknya, dibaca dari header file tanpa mengimpor modulnya."""
+    revisions = {}
+    for path in versions_dir.glob("*.py"):
+        header = dict(_HEADER.findall(path.read_text(encoding="utf-8")))
+        if "revision" not in header:
+            continue
+        down = ast.literal_eval(header.get("down_revision", "None"))
+        if down is None:
+            down = ()
+        elif isinstance(down, str):
+            down = (down,)
+        revisions[ast.literal_eval(header["revision"])] = tuple(down)
+    return revisions
+
+
+def heads(revisions: dict[str, tuple[str, ...]]) -> set[str]:
+    parents = {parent for downs in revisions.values() for parent in downs}
+    return set(revisions) - parents
+
+
+def current_revisions(engine: Engine | None = None) -> set[str]:
+    with (engine or get_engine()).connect() as connection:
+        if not inspect(connection).has_table("alembic_version"):
+            return set()
+        return set(connection.execute(text("SELECT version_num FROM alembic_version")).scalars())
+
+
+def alembic_config():
+    from alembic.config import Config
+
+    config = Config(str(MIGRATIONS_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    return config
+
+
+def upgrade(target: str) -> None:
+    if target == "head":
+        current, latest = current_revisions(), heads(read_revisions())
+        if current == latest:
+            print(f"Database sudah di revisi terbaru ({', '.join(sorted(latest))}).")
+            return
+
+    from alembic import command
+
+    command.upgrade(alembic_config(), target)
+
+
+def show_current() -> None:
+    current, latest = current_revisions(), heads(read_revisions())
+    if not current:
+        print("Database belum dimigrasikan.")
+        return
+    for revision in sorted(current):
+        print(f"{revision}{' (head)' if revision in latest else ''}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Migrasi database tanpa aplikasi Flask.")
+    commands = parser.add_subparsers(dest="command")
+    command = commands.add_parser("upgrade", help="Terapkan migrasi yang tertunda")
+    command.add_argument("revision", nargs="?", default="head")
+    commands.add_parser("current", help="Tampilkan revisi database saat ini")
+    command = commands.add_parser("estimate", help="Perkirakan lama migrasi tertunda tanpa menjalankannya")
+    command.add_argument("revision", nargs="?", default="head")
+    command.add_argument("--calibrate-rows", type=int, default=50_000, help="Ukuran tabel benchmark kalibrasi")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    if args.command == "current":
+        show_current()
+    elif args.command == "estimate":
+        from migration_estimate import print_estimate
+
+        print_estimate(args.revision, args.calibrate_rows)
+    else:
+        upgrade(getattr(args, "revision", "head"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""Perkiraan biaya migrasi yang tertunda tanpa menulis apa pun ke database.
+
+Setiap revisi tertunda dijalankan dengan ``op`` modul revisinya diganti
+perekam, yaitu ``Operations`` Alembic yang ``invoke``-nya mencatat operasi
+alih-alih mengeksekusinya. Untuk setiap operasi dilaporkan ukuran tabel yang
+disentuh (jumlah baris, halaman tabel beserta indeksnya dari ``dbstat``),
+apakah SQLite harus membangun ulang tabel, dan perkiraan lama yang dikalibrasi
+dengan benchmark singkat pada database sementara. Database dibuka read-only
+(``mode=ro``), jadi query baca di dalam revisi tetap berjalan.
+
+Ukuran tabel diambil dari keadaan database sebelum migrasi. Revisi berantai
+yang menambah isi tabel (mis. seed lalu indeks pada tabel yang sama) dihitung
+dengan ukuran lama, sehingga perkiraan revisi berikutnya terlalu rendah.
+"""
+from __future__ import annotations
+
+import random
+import re
+import tempfile
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations, ops
+from sqlalchemy import Connection, create_engine, text
+from sqlalchemy.exc import DBAPIError, OperationalError
+
+import migrate
+import migration_helpers
+from core import DATABASE_URI, apply_pragma_profile, read_only_uri
+
+# operasi yang tidak didukung ALTER TABLE SQLite; di luar batch mode harus membangun ulang tabel
+REBUILD_OPS = {
+    "drop_column",
+    "alter_column",
+    "create_foreign_key",
+    "create_unique_constraint",
+    "create_check_constraint",
+    "create_primary_key",
+    "drop_constraint",
+}
+# operasi yang hanya mengubah skema, lamanya tidak bergantung pada isi tabel
+CHEAP_OPS = {"create_table", "add_column", "rename_table", "drop_index", "create_table_comment", "drop_table_comment"}
+
+_TARGET_SQL = [
+    (re.compile(r"^\s*CREATE\s+(?:UNIQUE\s+)?INDEX\b.*?\bON\s+\"?(\w+)", re.I | re.S), "index"),
+    (re.compile(r"^\s*(?:CREATE|DROP)\s+TRIGGER\b.*?(?:\bON\s+\"?(\w+)|$)", re.I | re.S), None),
+    (re.compile(r"^\s*CREATE\s+VIRTUAL\s+TABLE\s+\"?(\w+)", re.I), None),
+    (re.compile(r"^\s*DROP\s+TABLE\s+(?:IF\s+EXISTS\s+)?\"?(\w+)", re.I), "drop"),
+    (re.compile(r"^\s*(?:DELETE\s+FROM|UPDATE)\s+\"?(\w+)", re.I), "write"),
+    (re.compile(r"^\s*INSERT\s+INTO\s+\"?(\w+)", re.I), "write"),
+]
+_FTS_CONTENT = re.compile(r"CREATE\s+VIRTUAL\s+TABLE\s+\"?(\w+).*?content\s*=\s*'(\w+)'", re.I | re.S)
+_FTS_REBUILD = re.compile(r"VALUES\s*\(\s*'rebuild'\s*\)", re.I)
+_OP_NAME = re.compile(r"(?<!^)(?=[A-Z])")
+
+
+@dataclass
+class Operation:
+    name: str
+    table: str | None
+    kind: str | None = None  # jenis kalibrasi: insert, index, fts, copy, write, drop
+    rows: int | None = None  # baris yang diproses bila bukan seluruh tabel (mis. seed)
+    rebuild: bool = False
+    note: str = ""
+
+
+@dataclass
+class RevisionEstimate:
+    revision: str
+    description: str
+    operations: list[Operation] = field(default_factory=list)
+    error: str | None = None
+
+
+class TableSizes:
+    """Jumlah baris, halaman, dan indeks tabel pada database saat ini (0 bila belum ada)."""
+
+    def __init__(self, connection: Connection) -> None:
+        self.connection = connection
+        self.cache: dict[str, tuple[int, int | None, int]] = {}
+
+    def get(self, table: str) -> tuple[int, int | None, int]:
+        if table not in self.cache:
+            self.cache[table] = self.measure(table)
+        return self.cache[table]
+
+    def measure(self, table: str) -> tuple[int, int | None, int]:
+        try:
+            rows = self.connection.exec_driver_sql(f'SELECT count(*) FROM "{table}"').scalar()
+        except DBAPIError:
+            self.connection.rollback()
+            return 0, 0, 0
+        indexes = self.connection.execute(
+            text("SELECT count(*) FROM sqlite_master WHERE type = 'index' AND tbl_name = :table"), {"table": table}
+        ).scalar()
+        try:
+            pages = self.connection.execute(
+                text(
+                    "SELECT count(*) FROM dbstat WHERE name = :table "
+                    "OR name IN (SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table)"
+                ),
+                {"table": table},
+            ).scalar()
+        except DBAPIError:
+            # SQLite tanpa SQLITE_ENABLE_DBSTAT_VTAB
+            self.connection.rollback()
+            pages = None
+        return rows, pages, indexes
+
+
+class _BatchRecorder:
+    """``batch_op`` palsu: perubahan di dalam batch sudah tercakup pembangunan ulang tabelnya."""
+
+    def __getattr__(self, name: str):
+        return lambda *args, **kwargs: None
+
+
+class OperationRecorder(Operations):
+    """``Operations`` yang mencatat setiap operasi di :meth:`invoke` tanpa menjalankannya.
+
+    Konteksnya ``MigrationContext`` pada koneksi read-only, jadi ``get_bind()``
+    di revisi tetap bisa membaca data.
+    """
+
+    def __init__(self, bind: Connection) -> None:
+        super().__init__(MigrationContext.configure(connection=bind))
+        self.operations: list[Operation] = []
+        self.fts_content: dict[str, str] = {}
+
+    def invoke(self, operation: ops.MigrateOperation) -> None:
+        if isinstance(operation, ops.ExecuteSQLOp):
+            self.record_sql(operation.sqltext)
+        elif isinstance(operation, ops.BulkInsertOp):
+            self.operations.append(Operation("bulk_insert", operation.table.name, "insert", rows=len(operation.rows)))
+        else:
+            # DropColumnOp -> drop_column, CreateForeignKeyOp -> create_foreign_key, ...
+            name = _OP_NAME.sub("_", type(operation).__name__.removesuffix("Op")).lower()
+            table = getattr(operation, "table_name", None) or getattr(operation, "source_table", None)
+            rebuild = name in REBUILD_OPS
+            if name in ("create_index", "drop_table"):
+                kind = "index" if name == "create_index" else "drop"
+            else:
+                kind = "copy" if rebuild else None if name in CHEAP_OPS else "write"
+            self.operations.append(Operation(name, table, kind, rebuild=rebuild))
+
+    def batch_alter_table(self, table_name: str, *args, **kwargs):
+        # perubahan di dalam batch sudah tercakup pembangunan ulang tabelnya
+        self.operations.append(Operation("batch_alter_table", table_name, "copy", rebuild=True))
+        return nullcontext(_BatchRecorder())
+
+    def record_sql(self, sqltext) -> None:
+        if not isinstance(sqltext, str):
+            table = getattr(getattr(sqltext, "table", None), "name", None)
+            self.operations.append(Operation("execute", table, "write", note=type(sqltext).__name__))
+            return
+        sql = sqltext.strip()
+        if match := _FTS_CONTENT.search(sql):
+            self.fts_content[match.group(1)] = match.group(2)
+        for pattern, kind in _TARGET_SQL:
+            if match := pattern.search(sql):
+                table = match.group(1)
+                if kind == "write" and _FTS_REBUILD.search(sql):
+                    # 'rebuild' FTS5 membaca ulang seluruh tabel kontennya
+                    kind, table = "fts", self.fts_content.get(table, table)
+                self.operations.append(Operation("execute", table, kind, note=" ".join(sql.split()[:2]).upper()))
+                return
+        self.operations.append(Operation("execute", None, note="SQL tidak dikenali"))
+
+    # pengganti helper migration_helpers yang dipanggil revisi
+
+    def seed_table(self, table, path: Path, chunk_size: int = 5_000, rebuild_indexes: bool = False) -> int:
+        rows = seed_rows(path)
+        self.operations.append(Operation("seed_table", table.name, "insert", rows=rows))
+        return rows
+
+    def unseed_table(self, table, path: Path, key: str = "id", chunk_size: int = 5_000) -> int:
+        rows = seed_rows(path)
+        self.operations.append(Operation("unseed_table", table.name, "write", rows=rows))
+        return rows
+
+    def copy_and_swap(self, table, chunk_size: int = 10_000, pause: float = 0.0) -> int:
+        self.operations.append(Operation("copy_and_swap", table.name, "copy", rebuild=True, note="bertahap"))
+        return 0
+
+
+def seed_rows(path: Path) -> int:
+    """Jumlah baris data file seed (baris judul CSV tidak dihitung)."""
+    with open(path, encoding="utf-8") as stream:
+        return sum(1 for line in stream if line.strip()) - (path.suffix == ".csv")
+
+
+@contextmanager
+def recording(module, recorder: OperationRecorder) -> Iterator[None]:
+    """Ganti ``op`` dan helper seed/swap di namespace modul revisi dengan ``recorder``."""
+    helpers = {
+        getattr(migration_helpers, name): getattr(recorder, name)
+        for name in ("seed_table", "unseed_table", "copy_and_swap")
+    }
+    patched = {name: value for name, value in vars(module).items() if callable(value) and value in helpers}
+    replacements = {name: helpers[value] for name, value in patched.items()}
+    if "op" in vars(module):
+        patched["op"] = vars(module)["op"]
+        replacements["op"] = recorder
+    vars(module).update(replacements)
+    try:
+        yield
+    finally:
+        vars(module).update(patched)
+
+
+def calibrate(rows: int = 50_000) -> dict[str, float]:
+    """Kecepatan (baris/detik) tiap jenis pekerjaan, diukur pada database sementara.
+
+    Database sementara memakai profil PRAGMA aplikasi, dan email dibuat acak agar
+    pembangunan indeks tidak mendapat data yang sudah terurut.
+    """
+    values = [(f"pengguna {i}", f"{random.getrandbits(64):x}@example.com") for i in range(rows)]
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = apply_pragma_profile(create_engine(f"sqlite:///{Path(workdir) / 'kalibrasi.sqlite3'}"))
+        with engine.connect() as connection:
+
+            def timed(sql: str, params=None) -> float:
+                started = time.perf_counter()
+                connection.exec_driver_sql(sql, params)
+                connection.commit()
+                return max(time.perf_counter() - started, 1e-6)
+
+            connection.exec_driver_sql("CREATE TABLE t (id INTEGER PRIMARY KEY, name VARCHAR(50), email VARCHAR(50))")
+            connection.exec_driver_sql("CREATE TABLE t_copy (id INTEGER PRIMARY KEY, name VARCHAR(50), email VARCHAR(50))")
+            connection.exec_driver_sql("CREATE VIRTUAL TABLE t_fts USING fts5(name, email, content='t', content_rowid='id')")
+            rates = {
+                "insert": rows / timed("INSERT INTO t (name, email) VALUES (?, ?)", values),
+                "index": rows / timed("CREATE INDEX ix_t_email ON t (email)"),
+                "fts": rows / timed("INSERT INTO t_fts (t_fts) VALUES ('rebuild')"),
+                "copy": rows / timed("INSERT INTO t_copy SELECT * FROM t"),
+                "write": rows / timed("UPDATE t SET name = name || '.'"),
+                "drop": rows / timed("DROP TABLE t_copy"),
+            }
+        engine.dispose()
+    return rates
+
+
+def operation_cost(operation: Operation, sizes: TableSizes, rates: dict[str, float]) -> float:
+    if operation.kind is None:
+        return 0.0
+    table_rows, _, indexes = sizes.get(operation.table) if operation.table else (0, None, 0)
+    rows = table_rows if operation.rows is None else operation.rows
+    seconds = rows / rates[operation.kind]
+    if operation.rebuild:
+        # tabel baru juga harus membangun ulang setiap indeksnya
+        seconds += indexes * table_rows / rates["index"]
+    return seconds
+
+
+def estimate_revisions(target: str = "head") -> tuple[list[RevisionEstimate], TableSizes]:
+    """Rekam operasi setiap revisi tertunda hingga ``target`` (urut dari yang terlama)."""
+    from alembic.runtime.environment import EnvironmentContext
+    from alembic.script import ScriptDirectory
+
+    config = migrate.alembic_config()
+    script = ScriptDirectory.from_config(config)
+    engine = create_engine(read_only_uri(DATABASE_URI))
+    try:
+        connection = engine.connect()
+    except OperationalError:
+        # file database belum ada: semua revisi tertunda dan semua tabel kosong
+        engine = create_engine("sqlite://")
+        connection = engine.connect()
+    current = migrate.current_revisions(engine)
+    pending = list(reversed(list(script.iterate_revisions(target, tuple(current) or "base"))))
+
+    estimates = []
+    # context.is_offline_mode() di revisi butuh EnvironmentContext; env.py sendiri tidak dijalankan
+    with EnvironmentContext(config, script):
+        for revision in pending:
+            recorder = OperationRecorder(connection)
+            estimate = RevisionEstimate(revision.revision, revision.doc or "")
+            try:
+                with recording(revision.module, recorder):
+                    revision.module.upgrade()
+            except Exception as exc:
+                connection.rollback()
+                estimate.error = f"{type(exc).__name__}: {str(exc).splitlines()[0]}"
+            estimate.operations = recorder.operations
+            estimates.append(estimate)
+    return estimates, TableSizes(connection)
+
+
+def print_estimate(target: str = "head", calibrate_rows: int = 50_000) -> None:
+    estimates, sizes = estimate_revisions(target)
+    if not estimates:
+        sizes.connection.close()
+        print("Tidak ada migrasi tertunda.")
+        return
+    rates = calibrate(calibrate_rows)
+
+    total = 0.0
+    for estimate in estimates:
+        print(f"{estimate.revision}  {estimate.description}")
+        revision_total = 0.0
+        for operation in estimate.operations:
+            rows, pages, _ = sizes.get(operation.table) if operation.table else (0, None, 0)
+            if operation.rows is not None:
+                rows = operation.rows
+            seconds = operation_cost(operation, sizes, rates)
+            revision_total += seconds
+            label = f"{operation.name} {operation.note}".strip()
+            print(
+                f"  {label:<34} {operation.table or '-':<14} {rows:>10} baris "
+                f"{'-' if pages is None else pages:>8} halaman  {'REBUILD' if operation.rebuild else '':<7} "
+                f"~{seconds:.2f} s"
+            )
+        if estimate.error:
+            print(f"  (perekaman berhenti: {estimate.error})")
+        print(f"  {'total revisi':<34} {'':<14} {'':>16} {'':>16} {'':<7} ~{revision_total:.2f} s")
+        total += revision_total
+    sizes.connection.close()
+
+    print(f"\nTotal {len(estimates)} revisi: ~{total:.2f} s")
+    print("Ukuran tabel dari database sebelum migrasi; tabel yang diisi revisi sebelumnya dihitung terlalu kecil.")
+    print(
+        "Kalibrasi (baris/detik): "
+        + ", ".join(f"{kind} {rate:,.0f}" for kind, rate in rates.items())
+        + f" dari {calibrate_rows} baris contoh"
+    )
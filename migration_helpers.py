@@ -0,0 +1,371 @@
+"""Helper untuk skrip migrasi Alembic dan ``migrations/env.py``.
+
+Seed data dibaca dari file CSV/NDJSON di samping revisi, bukan ditulis sebagai
+literal Python, lalu dimasukkan per potongan dengan ``executemany``. Nama file
+mengikuti revisinya: ``<nama file revisi>.<tabel>.csv`` (atau ``.ndjson``)::
+
+    users = sa.table('user', sa.column('id', sa.Integer), ...)
+
+    def upgrade():
+        seed_table(users, seed_file(__file__, 'user'))
+
+    def downgrade():
+        unseed_table(users, seed_file(__file__, 'user'))
+"""
+from __future__ import annotations
+
+import csv
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, TextIO
+
+import sqlalchemy as sa
+from alembic import op
+from alembic.migration import MigrationContext, MigrationInfo
+
+logger = logging.getLogger("alembic.seed")
+timing_logger = logging.getLogger("alembic.timings")
+swap_logger = logging.getLogger("alembic.swap")
+
+SEED_FORMATS = (".csv", ".ndjson")
+
+
+def seed_file(revision_file: str, table_name: str) -> Path:
+    """Cari file seed ``<revisi>.<tabel>.csv|.ndjson`` di samping file revisi."""
+    revision = Path(revision_file)
+    for suffix in SEED_FORMATS:
+        path = revision.with_name(f"{revision.stem}.{table_name}{suffix}")
+        if path.exists():
+            return path
+    raise FileNotFoundError(f"File seed untuk tabel {table_name} tidak ditemukan di samping {revision.name}")
+
+
+def iter_seed_rows(path: Path, table: sa.sql.TableClause) -> Iterator[dict[str, object]]:
+    """Baca baris seed satu per satu; nilai CSV dikonversi sesuai tipe kolom tabel."""
+    with open(path, newline="", encoding="utf-8") as stream:
+        if path.suffix == ".ndjson":
+            for line in stream:
+                if line.strip():
+                    yield json.loads(line)
+            return
+        converters = {
+            column.name: int if isinstance(column.type, sa.Integer) else str for column in table.columns
+        }
+        for record in csv.DictReader(stream):
+            # sel CSV kosong berarti NULL
+            yield {key: converters.get(key, str)(value) if value != "" else None for key, value in record.items()}
+
+
+def chunks(rows: Iterator[dict[str, object]], size: int) -> Iterator[list[dict[str, object]]]:
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def table_indexes(table_name: str) -> list[tuple[str, str]]:
+    """Nama dan DDL indeks yang dibuat eksplisit pada tabel (bukan indeks otomatis SQLite)."""
+    rows = op.get_bind().execute(
+        sa.text("SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = :table AND sql IS NOT NULL"),
+        {"table": table_name},
+    )
+    return [(row.name, row.sql) for row in rows]
+
+
+def seed_table(
+    table: sa.sql.TableClause,
+    path: Path,
+    chunk_size: int = 5_000,
+    rebuild_indexes: bool = False,
+) -> int:
+    """Masukkan seluruh baris ``path`` ke ``table`` per ``chunk_size`` baris.
+
+    Dengan ``rebuild_indexes=True`` indeks tabel dibuang sebelum memuat dan
+    dibangun ulang sekali sesudahnya, lebih cepat untuk seed yang sangat besar.
+    Mengembalikan jumlah baris yang dimasukkan.
+    """
+    started = time.perf_counter()
+    offline = op.get_context().as_sql
+    indexes = table_indexes(table.name) if rebuild_indexes and not offline else []
+    for name, _ in indexes:
+        op.execute(f'DROP INDEX "{name}"')
+
+    inserted = 0
+    for chunk in chunks(iter_seed_rows(path, table), chunk_size):
+        if offline:
+            op.bulk_insert(table, chunk)
+        else:
+            op.get_bind().execute(table.insert(), chunk)
+        inserted += len(chunk)
+
+    for _, ddl in indexes:
+        op.execute(ddl)
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        "seed %s: %d baris dari %s dalam %.2f detik (%.0f baris/detik)",
+        table.name,
+        inserted,
+        path.name,
+        elapsed,
+        inserted / elapsed if elapsed else 0.0,
+    )
+    return inserted
+
+
+def unseed_table(table: sa.sql.TableClause, path: Path, key: str = "id", chunk_size: int = 5_000) -> int:
+    """Hapus baris yang di-seed dari ``path`` berdasarkan kolom ``key``.
+
+    Kunci dibaca dari file yang sama lalu dihapus dengan satu ``DELETE ... IN``
+    per potongan, bukan satu pernyataan per baris.
+    """
+    column = table.c[key]
+    deleted = 0
+    for chunk in chunks(iter_seed_rows(path, table), chunk_size):
+        op.execute(table.delete().where(column.in_([row[key] for row in chunk])))
+        deleted += len(chunk)
+    logger.info("unseed %s: %d kunci dari %s", table.name, deleted, path.name)
+    return deleted
+
+
+def copy_and_swap(table: sa.Table, chunk_size: int = 10_000, pause: float = 0.0) -> int:
+    """Bangun ulang tabel SQLite menjadi bentuk ``table`` tanpa mengunci penulis selama penyalinan.
+
+    Pengganti ``batch_alter_table``/``drop_column`` untuk tabel besar. Tabel baru
+    dibuat dengan nama sementara, lalu baris disalin per rentang kunci
+    ``chunk_size`` yang masing-masing di-commit sendiri (jeda ``pause`` detik di
+    antaranya memberi kesempatan penulis lain). Trigger sementara pada tabel lama
+    meneruskan perubahan yang terjadi selama penyalinan ke tabel baru. Terakhir
+    satu transaksi singkat menghapus tabel lama, mengganti nama tabel baru, dan
+    membuat ulang indeks ``table``, indeks tabel lama yang tidak dideklarasikan
+    di ``table`` (dari SQL aslinya), serta trigger milik tabel lama. Indeks baru
+    dibangun di dalam transaksi itu (SQLite tidak bisa mengganti nama indeks),
+    jadi penulis menunggu sebatas lama pembangunan indeks; pembaca WAL tetap jalan.
+
+    ``table`` adalah definisi akhir tabel dengan nama yang sama dan satu primary
+    key integer. Kolom yang ada di kedua tabel disalin; kolom baru memakai
+    default-nya. Karena setiap potongan di-commit, transaksi migrasi yang sedang
+    berjalan ikut di-commit lebih dulu (``autocommit_block``). Mengembalikan
+    jumlah baris yang disalin. ``RuntimeError`` bila dijalankan dengan ``--sql``
+    atau bila indeks lama yang tidak dideklarasikan merujuk kolom yang hilang.
+    """
+    name = table.name
+    temp_name = f"_swap_{name}"
+    (key,) = [column.name for column in table.primary_key.columns]
+    context = op.get_context()
+    if context.as_sql:
+        raise RuntimeError(f"copy_and_swap({name}) perlu koneksi database; jalankan tanpa --sql")
+
+    with context.autocommit_block():
+        bind = op.get_bind()
+        inspector = sa.inspect(bind)
+        old_columns = {column["name"] for column in inspector.get_columns(name)}
+        new_columns = {column.name for column in table.columns}
+        # indeks yang tidak dideklarasikan di table tetap dipertahankan, kecuali kolomnya ikut dihapus
+        declared = {index.name for index in table.indexes}
+        kept_indexes = []
+        for index in inspector.get_indexes(name):
+            if index["name"] in declared:
+                continue
+            missing = [column for column in index["column_names"] if column and column not in new_columns]
+            if missing:
+                raise RuntimeError(
+                    f"copy_and_swap({name}): indeks {index['name']} memakai kolom {', '.join(missing)} "
+                    "yang tidak ada di tabel baru; hapus indeks itu lebih dulu atau deklarasikan di table"
+                )
+            kept_indexes.append(
+                bind.execute(
+                    sa.text("SELECT sql FROM sqlite_master WHERE type = 'index' AND name = :name"),
+                    {"name": index["name"]},
+                ).scalar()
+            )
+        columns = ", ".join(f'"{column.name}"' for column in table.columns if column.name in old_columns)
+        new_values = ", ".join(f'NEW."{column.name}"' for column in table.columns if column.name in old_columns)
+        triggers = [
+            row.sql
+            for row in bind.execute(
+                sa.text("SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = :table"),
+                {"table": name},
+            )
+            if not row.name.startswith("_swap_")
+        ]
+
+        # sisa percobaan sebelumnya yang terhenti dibuang; penyalinan selalu dimulai dari awal
+        for suffix in ("insert", "update", "delete"):
+            bind.exec_driver_sql(f'DROP TRIGGER IF EXISTS "{temp_name}_{suffix}"')
+        bind.exec_driver_sql(f'DROP TABLE IF EXISTS "{temp_name}"')
+        # CreateTable tidak ikut membuat indeks; indeks dibuat setelah nama ditukar
+        bind.exec_driver_sql(str(sa.schema.CreateTable(table.to_metadata(sa.MetaData(), name=temp_name)).compile(bind)))
+
+        upsert = f'INSERT OR REPLACE INTO "{temp_name}" ({columns}) VALUES ({new_values});'
+        remove = f'DELETE FROM "{temp_name}" WHERE "{key}" = OLD."{key}";'
+        bind.exec_driver_sql(f'CREATE TRIGGER "{temp_name}_insert" AFTER INSERT ON "{name}" BEGIN {upsert} END')
+        bind.exec_driver_sql(f'CREATE TRIGGER "{temp_name}_update" AFTER UPDATE ON "{name}" BEGIN {remove} {upsert} END')
+        bind.exec_driver_sql(f'CREATE TRIGGER "{temp_name}_delete" AFTER DELETE ON "{name}" BEGIN {remove} END')
+
+        total = bind.exec_driver_sql(f'SELECT count(*) FROM "{name}"').scalar()
+        started = time.perf_counter()
+        copied = 0
+        last = -(2**63)
+        while True:
+            upper = bind.execute(
+                sa.text(f'SELECT "{key}" FROM "{name}" WHERE "{key}" > :last ORDER BY "{key}" LIMIT 1 OFFSET :offset'),
+                {"last": last, "offset": chunk_size - 1},
+            ).scalar()
+            bounds = f'"{key}" > :last' + ("" if upper is None else f' AND "{key}" <= :upper')
+            result = bind.execute(
+                sa.text(f'INSERT OR REPLACE INTO "{temp_name}" ({columns}) SELECT {columns} FROM "{name}" WHERE {bounds}'),
+                {"last": last, "upper": upper},
+            )
+            copied += result.rowcount
+            elapsed = time.perf_counter() - started
+            swap_logger.info(
+                "salin %s: %d/%d baris (%.0f%%), %.0f baris/detik",
+                name,
+                copied,
+                total,
+                copied / total * 100 if total else 100.0,
+                copied / elapsed if elapsed else 0.0,
+            )
+            if upper is None:
+                break
+            last = upper
+            if pause:
+                time.sleep(pause)
+
+        # tukar nama dalam satu transaksi singkat; legacy_alter_table mencegah SQLite memeriksa ulang
+        # trigger tabel lain yang merujuk tabel lama selagi tabel itu sempat tidak ada
+        swap_started = time.perf_counter()
+        bind.exec_driver_sql("PRAGMA legacy_alter_table=ON")
+        bind.exec_driver_sql("BEGIN IMMEDIATE")
+        try:
+            bind.exec_driver_sql(f'DROP TABLE "{name}"')
+            bind.exec_driver_sql(f'ALTER TABLE "{temp_name}" RENAME TO "{name}"')
+            for index in table.indexes:
+                bind.exec_driver_sql(str(sa.schema.CreateIndex(index).compile(bind)))
+            for ddl in kept_indexes:
+                bind.exec_driver_sql(ddl)
+            for ddl in triggers:
+                bind.exec_driver_sql(ddl)
+            bind.exec_driver_sql("COMMIT")
+        except Exception:
+            bind.exec_driver_sql("ROLLBACK")
+            raise
+        finally:
+            bind.exec_driver_sql("PRAGMA legacy_alter_table=OFF")
+
+    swap_logger.info(
+        "tukar %s: %d baris disalin dalam %.2f detik, transaksi penukaran %.0f ms",
+        name,
+        copied,
+        time.perf_counter() - started,
+        (time.perf_counter() - swap_started) * 1000,
+    )
+    return copied
+
+
+# riwayat lama tiap langkah revisi; diisi oleh MigrationTimer, bukan bagian dari model
+migration_timings = sa.Table(
+    "migration_timings",
+    sa.MetaData(),
+    sa.Column("id", sa.Integer, primary_key=True),
+    sa.Column("revision", sa.String(32), nullable=False),
+    sa.Column("direction", sa.String(9), nullable=False),
+    sa.Column("description", sa.String(255)),
+    sa.Column("applied_at", sa.DateTime, nullable=False),
+    sa.Column("duration_ms", sa.Float, nullable=False),
+    sa.Column("statements", sa.Integer, nullable=False),
+    sa.Column("rows", sa.Integer),
+)
+
+
+class StatementCounter:
+    """Pembungkus output ``--sql`` yang menghitung pernyataan (teks berakhiran ``;``)."""
+
+    def __init__(self, buffer: TextIO, timer: MigrationTimer) -> None:
+        self.buffer = buffer
+        self.timer = timer
+
+    def write(self, text: str) -> int:
+        if text.rstrip().endswith(";"):
+            self.timer.statements += 1
+        return self.buffer.write(text)
+
+    def flush(self) -> None:
+        self.buffer.flush()
+
+
+class MigrationTimer:
+    """Ukur lama, jumlah pernyataan, dan baris terdampak setiap langkah revisi.
+
+    ``env.py`` memasang ``watch(connection)`` (mode online, lewat event kursor)
+    atau ``count_output(buffer)`` (mode ``--sql``), lalu memberikan
+    ``on_version_apply`` ke ``context.configure``. Pada mode online setiap
+    langkah disimpan ke tabel ``migration_timings`` dalam transaksi migrasi.
+    """
+
+    def __init__(self) -> None:
+        self.steps: list[dict[str, object]] = []
+        self.start()
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        self.statements = 0
+        self.rows = 0
+
+    def watch(self, connection: sa.Connection) -> None:
+        sa.event.listen(connection, "after_cursor_execute", self.count_statement)
+
+    def count_output(self, buffer: TextIO) -> StatementCounter:
+        return StatementCounter(buffer, self)
+
+    def count_statement(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.statements += 1
+        if cursor.rowcount > 0:
+            self.rows += cursor.rowcount
+
+    def on_version_apply(self, ctx: MigrationContext, step: MigrationInfo, heads, run_args) -> None:
+        record = {
+            "revision": step.up_revision_id,
+            "direction": "upgrade" if step.is_upgrade else "downgrade",
+            "description": (step.up_revision.doc or "")[:255],
+            "applied_at": datetime.now(timezone.utc).replace(tzinfo=None),
+            "duration_ms": (time.perf_counter() - self.started) * 1000,
+            "statements": self.statements,
+            "rows": None if ctx.as_sql else self.rows,
+        }
+        self.steps.append(record)
+        if not ctx.as_sql:
+            migration_timings.create(ctx.connection, checkfirst=True)
+            ctx.connection.execute(migration_timings.insert(), record)
+        # pernyataan pencatatan di atas tidak ikut dihitung ke langkah berikutnya
+        self.start()
+
+    def log_summary(self) -> None:
+        if not self.steps:
+            return
+        timing_logger.info("Lama migrasi per revisi:")
+        for step in self.steps:
+            timing_logger.info(
+                "  %-9s %-12s %9.1f ms %6d pernyataan %9s baris  %s",
+                step["direction"],
+                step["revision"],
+                step["duration_ms"],
+                step["statements"],
+                "-" if step["rows"] is None else step["rows"],
+                step["description"],
+            )
+        total = sum(step["duration_ms"] for step in self.steps)
+        timing_logger.info("  total %d langkah dalam %.1f ms", len(self.steps), total)
+
+
+def timing_history(connection: sa.Connection, limit: int, revision: str | None = None) -> list[sa.Row]:
+    """Langkah migrasi terbaru dari ``migration_timings`` (kosong bila tabel belum ada)."""
+    if not sa.inspect(connection).has_table(migration_timings.name):
+        return []
+    statement = sa.select(migration_timings).order_by(migration_timings.c.id.desc()).limit(limit)
+    if revision:
+        statement = statement.where(migration_timings.c.revision == revision)
+    return connection.execute(statement).all()
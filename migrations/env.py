@@ -1,12 +1,13 @@
 from __future__ import with_statement
 
 import logging
+import sys
 from logging.config import fileConfig
 
-from flask import current_app
-
 from alembic import context
 
+from migration_helpers import MigrationTimer, migration_timings
+
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
@@ -20,11 +21,28 @@ logger = logging.getLogger('alembic.env')
 # for 'autogenerate' support
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
+def flask_migrate_extension():
+    """Ekstensi Flask-Migrate saat dijalankan lewat `flask db`, None bila lewat migrate.py."""
+    # Flask hanya diimpor bila sudah dimuat pemanggil, supaya runner mandiri tetap ringan
+    if 'flask' not in sys.modules:
+        return None
+    from flask import current_app, has_app_context
+    return current_app.extensions['migrate'] if has_app_context() else None
+
+
+migrate_ext = flask_migrate_extension()
+if migrate_ext is not None:
+    engine = migrate_ext.db.get_engine()
+    target_metadata = migrate_ext.db.metadata
+    configure_args = migrate_ext.configure_args
+else:
+    # tanpa aplikasi Flask: URL dan metadata langsung dari core (hanya bergantung pada SQLAlchemy)
+    from core import Base, get_engine
+    engine = get_engine()
+    target_metadata = Base.metadata
+    configure_args = {}
 config.set_main_option(
-    'sqlalchemy.url',
-    str(current_app.extensions['migrate'].db.get_engine().url).replace(
-        '%', '%%'))
-target_metadata = current_app.extensions['migrate'].db.metadata
+    'sqlalchemy.url', str(engine.url).replace('%', '%%'))
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -45,12 +63,16 @@ def run_migrations_offline():
 
     """
     url = config.get_main_option("sqlalchemy.url")
+    timer = MigrationTimer()
     context.configure(
-        url=url, target_metadata=target_metadata, literal_binds=True
+        url=url, target_metadata=target_metadata, literal_binds=True,
+        output_buffer=timer.count_output(config.output_buffer or sys.stdout),
+        on_version_apply=timer.on_version_apply,
     )
 
     with context.begin_transaction():
         context.run_migrations()
+    timer.log_summary()
 
 
 def run_migrations_online():
@@ -71,18 +93,45 @@ def run_migrations_online():
                 directives[:] = []
                 logger.info('No changes in schema detected.')
 
-    connectable = current_app.extensions['migrate'].db.get_engine()
-
-    with connectable.connect() as connection:
-        context.configure(
-            connection=connection,
-            target_metadata=target_metadata,
-            process_revision_directives=process_revision_directives,
-            **current_app.extensions['migrate'].configure_args
-        )
-
-        with context.begin_transaction():
-            context.run_migrations()
+    # tabel virtual FTS5 beserta tabel bayangannya dibuat migrasi manual dan migration_timings
+    # diisi env.py ini, bukan dari model, jadi jangan sampai autogenerate mengusulkan untuk menghapusnya
+    def include_name(name, type_, parent_names):
+        if type_ == 'table':
+            return not name.startswith('user_fts') and name != migration_timings.name
+        return True
+
+    with engine.connect() as connection:
+        # koneksi aplikasi menyalakan foreign_keys; saat migrasi dimatikan agar tabel induk
+        # yang dibangun ulang (batch mode) tidak memicu ON DELETE CASCADE ke tabel anak.
+        # PRAGMA ini tidak berlaku di dalam transaksi, jadi dijalankan dan di-commit lebih dulu.
+        sqlite = connection.dialect.name == 'sqlite'
+        if sqlite:
+            connection.exec_driver_sql('PRAGMA foreign_keys=OFF')
+            connection.commit()
+
+        try:
+            # lama, jumlah pernyataan, dan baris terdampak tiap revisi dicatat ke migration_timings
+            timer = MigrationTimer()
+            timer.watch(connection)
+            context.configure(
+                connection=connection,
+                target_metadata=target_metadata,
+                process_revision_directives=process_revision_directives,
+                include_name=include_name,
+                on_version_apply=timer.on_version_apply,
+                **configure_args
+            )
+
+            with context.begin_transaction():
+                context.run_migrations()
+            timer.log_summary()
+        finally:
+            # koneksi kembali ke pool (flask db / migrate.py memakai engine aplikasi);
+            # nyalakan lagi agar session berikutnya tetap menegakkan foreign key dan CASCADE
+            if sqlite:
+                connection.rollback()
+                connection.exec_driver_sql('PRAGMA foreign_keys=ON')
+                connection.commit()
 
 
 if context.is_offline_mode():
@@ -8,6 +8,8 @@ Create Date: 2025-10-28 07:52:23.405801
 from alembic import op
 import sqlalchemy as sa
 
+from migration_helpers import seed_file, seed_table
+
 
 # revision identifiers, used by Alembic.
 revision = '15e3a17be3d4'
@@ -47,22 +49,8 @@ def upgrade():
     )
     # ### end Alembic commands ###
 
-    op.bulk_insert(
-        ruangan_table,
-        [
-            {'id': 1, 'name': 'Lab Komputer'},
-            {'id': 2, 'name': 'Ruang Rapat'},
-            {'id': 3, 'name': 'Aula Serbaguna'},
-        ],
-    )
-
-    op.bulk_insert(
-        ruangan_user_table,
-        [
-            {'id': 1, 'user_id': 101, 'ruangan_id': 1},
-            {'id': 2, 'user_id': 102, 'ruangan_id': 2},
-        ],
-    )
+    seed_table(ruangan_table, seed_file(__file__, 'ruangan'))
+    seed_table(ruangan_user_table, seed_file(__file__, 'ruangan_user'))
 
 
 def downgrade():
@@ -0,0 +1,57 @@
+"""Tambah occupant_count ruangan
+
+Revision ID: 23e5e7dba65f
+Revises: 6af8c579a9c3
+Create Date: 2026-10-18 00:12:47.903311
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '23e5e7dba65f'
+down_revision = '6af8c579a9c3'
+branch_labels = None
+depends_on = None
+
+# trigger melekat pada tabel ruangan_user: migrasi yang membangun ulang tabel itu
+# (batch mode) ikut menghapusnya dan wajib membuatnya kembali
+triggers = {
+    'trg_ruangan_user_insert_count': """
+        CREATE TRIGGER trg_ruangan_user_insert_count AFTER INSERT ON ruangan_user
+        BEGIN
+            UPDATE ruangan SET occupant_count = occupant_count + 1 WHERE id = NEW.ruangan_id;
+        END
+    """,
+    'trg_ruangan_user_delete_count': """
+        CREATE TRIGGER trg_ruangan_user_delete_count AFTER DELETE ON ruangan_user
+        BEGIN
+            UPDATE ruangan SET occupant_count = occupant_count - 1 WHERE id = OLD.ruangan_id;
+        END
+    """,
+    'trg_ruangan_user_update_count': """
+        CREATE TRIGGER trg_ruangan_user_update_count AFTER UPDATE OF ruangan_id ON ruangan_user
+        WHEN OLD.ruangan_id IS NOT NEW.ruangan_id
+        BEGIN
+            UPDATE ruangan SET occupant_count = occupant_count - 1 WHERE id = OLD.ruangan_id;
+            UPDATE ruangan SET occupant_count = occupant_count + 1 WHERE id = NEW.ruangan_id;
+        END
+    """,
+}
+
+
+def upgrade():
+    op.add_column('ruangan', sa.Column('occupant_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute(
+        'UPDATE ruangan SET occupant_count = '
+        '(SELECT COUNT(*) FROM ruangan_user WHERE ruangan_user.ruangan_id = ruangan.id)'
+    )
+    for statement in triggers.values():
+        op.execute(statement)
+
+
+def downgrade():
+    for name in triggers:
+        op.execute(f'DROP TRIGGER IF EXISTS {name}')
+    op.drop_column('ruangan', 'occupant_count')
@@ -0,0 +1,37 @@
+"""Perluas indeks awalan user_fts
+
+Revision ID: 2a1118dff5eb
+Revises: 303d8a499857
+Create Date: 2026-10-19 09:12:04.518302
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '2a1118dff5eb'
+down_revision = '303d8a499857'
+branch_labels = None
+depends_on = None
+
+
+def create_user_fts(prefix):
+    # opsi prefix FTS5 tidak bisa diubah: tabel dibuat ulang lalu indeksnya dibangun dari user;
+    # trigger trg_user_fts_* merujuk tabel lewat nama sehingga tetap berlaku
+    op.execute('DROP TABLE user_fts')
+    op.execute(
+        "CREATE VIRTUAL TABLE user_fts USING fts5("
+        "name, email, content='user', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='{prefix}')"
+    )
+    op.execute("INSERT INTO user_fts (user_fts) VALUES ('rebuild')")
+
+
+def upgrade():
+    # awalan 4-6 huruf yang cocok dengan ribuan kata berbeda (mis. budi* -> budiman1, budiman2, ...)
+    # cukup membaca satu doclist, bukan menggabungkan doclist setiap kata
+    create_user_fts('2 3 4 5 6')
+
+
+def downgrade():
+    create_user_fts('2 3')
@@ -0,0 +1,58 @@
+"""Tambah indeks FTS5 user
+
+Revision ID: 303d8a499857
+Revises: 23e5e7dba65f
+Create Date: 2026-10-18 00:58:31.226470
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '303d8a499857'
+down_revision = '23e5e7dba65f'
+branch_labels = None
+depends_on = None
+
+# trigger melekat pada tabel user: migrasi yang membangun ulang tabel itu
+# (batch mode) ikut menghapusnya dan wajib membuatnya kembali
+triggers = {
+    'trg_user_fts_insert': """
+        CREATE TRIGGER trg_user_fts_insert AFTER INSERT ON user
+        BEGIN
+            INSERT INTO user_fts (rowid, name, email) VALUES (NEW.id, NEW.name, NEW.email);
+        END
+    """,
+    'trg_user_fts_delete': """
+        CREATE TRIGGER trg_user_fts_delete AFTER DELETE ON user
+        BEGIN
+            INSERT INTO user_fts (user_fts, rowid, name, email) VALUES ('delete', OLD.id, OLD.name, OLD.email);
+        END
+    """,
+    'trg_user_fts_update': """
+        CREATE TRIGGER trg_user_fts_update AFTER UPDATE OF name, email ON user
+        BEGIN
+            INSERT INTO user_fts (user_fts, rowid, name, email) VALUES ('delete', OLD.id, OLD.name, OLD.email);
+            INSERT INTO user_fts (rowid, name, email) VALUES (NEW.id, NEW.name, NEW.email);
+        END
+    """,
+}
+
+
+def upgrade():
+    # tabel external-content: teks tetap disimpan di user, FTS5 hanya menyimpan indeksnya;
+    # indeks awalan 2 dan 3 huruf mempercepat pencarian typeahead
+    op.execute(
+        "CREATE VIRTUAL TABLE user_fts USING fts5("
+        "name, email, content='user', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+    op.execute("INSERT INTO user_fts (user_fts) VALUES ('rebuild')")
+    for statement in triggers.values():
+        op.execute(statement)
+
+
+def downgrade():
+    for name in triggers:
+        op.execute(f'DROP TRIGGER IF EXISTS {name}')
+    op.execute('DROP TABLE IF EXISTS user_fts')
@@ -0,0 +1,47 @@
+"""Cascade hapus relasi ruangan_user
+
+Revision ID: 6af8c579a9c3
+Revises: fe1b403e6e07
+Create Date: 2026-10-17 23:40:12.518204
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '6af8c579a9c3'
+down_revision = 'fe1b403e6e07'
+branch_labels = None
+depends_on = None
+
+# foreign key bawaan tidak bernama; konvensi ini memberi nama agar batch mode bisa menggantinya
+naming_convention = {
+    'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s',
+}
+
+
+def upgrade():
+    # relasi yatim (mis. dari penghapusan pengguna lama via CLI) akan melanggar foreign key
+    op.execute(
+        'DELETE FROM ruangan_user '
+        'WHERE user_id NOT IN (SELECT id FROM user) OR ruangan_id NOT IN (SELECT id FROM ruangan)'
+    )
+
+    # SQLite tidak bisa mengubah foreign key di tempat, jadi tabel dibangun ulang (batch mode)
+    with op.batch_alter_table('ruangan_user', naming_convention=naming_convention, recreate='always') as batch_op:
+        batch_op.drop_constraint('fk_ruangan_user_user_id_user', type_='foreignkey')
+        batch_op.drop_constraint('fk_ruangan_user_ruangan_id_ruangan', type_='foreignkey')
+        batch_op.create_foreign_key(
+            'fk_ruangan_user_user_id_user', 'user', ['user_id'], ['id'], ondelete='CASCADE'
+        )
+        batch_op.create_foreign_key(
+            'fk_ruangan_user_ruangan_id_ruangan', 'ruangan', ['ruangan_id'], ['id'], ondelete='CASCADE'
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('ruangan_user', naming_convention=naming_convention, recreate='always') as batch_op:
+        batch_op.drop_constraint('fk_ruangan_user_user_id_user', type_='foreignkey')
+        batch_op.drop_constraint('fk_ruangan_user_ruangan_id_ruangan', type_='foreignkey')
+        batch_op.create_foreign_key('fk_ruangan_user_user_id_user', 'user', ['user_id'], ['id'])
+        batch_op.create_foreign_key('fk_ruangan_user_ruangan_id_ruangan', 'ruangan', ['ruangan_id'], ['id'])
@@ -5,9 +5,10 @@ Revises: 0f4c2eb9e0fe
 Create Date: 2025-10-28 07:48:53.116463
 
 """
-from alembic import op
 import sqlalchemy as sa
 
+from migration_helpers import seed_file, seed_table, unseed_table
+
 
 # revision identifiers, used by Alembic.
 revision = '6d278d92961d'
@@ -16,9 +17,6 @@ branch_labels = None
 depends_on = None
 
 
-from alembic import op
-import sqlalchemy as sa
-
 users = sa.table(
     'user',
     sa.Column('id', sa.Integer),
@@ -27,15 +25,7 @@ users = sa.table(
 )
 
 def upgrade():
-    op.bulk_insert(
-        users,
-        [
-            {'id': 101, 'name': 'Contoh 1', 'email': 'contoh1@example.com'},
-            {'id': 102, 'name': 'Contoh 2', 'email': 'contoh2@example.com'},
-        ],
-    )
+    seed_table(users, seed_file(__file__, 'user'))
 
 def downgrade():
-    op.execute(
-        users.delete().where(users.c.id.in_([101, 102]))
-    )
\ No newline at end of file
+    unseed_table(users, seed_file(__file__, 'user'))
@@ -0,0 +1,60 @@
+"""Wajibkan nama dan email user
+
+Revision ID: 7caba4a5c925
+Revises: 2a1118dff5eb
+Create Date: 2026-10-19 14:27:41.903518
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+from migration_helpers import copy_and_swap
+
+
+# revision identifiers, used by Alembic.
+revision = '7caba4a5c925'
+down_revision = '2a1118dff5eb'
+branch_labels = None
+depends_on = None
+
+
+def users_table(nullable):
+    return sa.Table(
+        'user',
+        sa.MetaData(),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=50), nullable=nullable),
+        sa.Column('email', sa.String(length=50), nullable=nullable),
+        sa.PrimaryKeyConstraint('id'),
+        sa.Index('ix_user_email', 'email', unique=True),
+    )
+
+
+def rebuild(nullable):
+    if context.is_offline_mode():
+        # --sql tidak punya koneksi untuk menyalin bertahap: batch mode menulis ulang tabel
+        # sekaligus, dan trigger FTS milik tabel lama ikut hilang sehingga dibuat kembali
+        with op.batch_alter_table('user', copy_from=users_table(not nullable), recreate='always') as batch_op:
+            batch_op.alter_column('name', existing_type=sa.String(length=50), nullable=nullable)
+            batch_op.alter_column('email', existing_type=sa.String(length=50), nullable=nullable)
+        for statement in context.script.get_revision('303d8a499857').module.triggers.values():
+            op.execute(statement)
+    else:
+        # NOT NULL butuh pembangunan ulang tabel; salin bertahap agar penulis lain tidak terkunci
+        copy_and_swap(users_table(nullable))
+
+
+def upgrade():
+    if not context.is_offline_mode():
+        missing = op.get_bind().exec_driver_sql(
+            'SELECT count(*) FROM user WHERE name IS NULL OR email IS NULL'
+        ).scalar()
+        if missing:
+            raise RuntimeError(
+                f'{missing} pengguna belum punya nama atau email; lengkapi atau hapus sebelum migrasi ini'
+            )
+    rebuild(nullable=False)
+
+
+def downgrade():
+    rebuild(nullable=True)
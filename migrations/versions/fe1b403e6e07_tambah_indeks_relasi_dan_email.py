@@ -0,0 +1,44 @@
+"""Tambah indeks relasi ruangan_user dan email user
+
+Revision ID: fe1b403e6e07
+Revises: 15e3a17be3d4
+Create Date: 2026-10-17 22:25:22.104215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'fe1b403e6e07'
+down_revision = '15e3a17be3d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # relasi ganda harus dibuang dulu agar indeks unik (user_id, ruangan_id) bisa dibuat
+    op.execute(
+        'DELETE FROM ruangan_user WHERE id NOT IN '
+        '(SELECT MIN(id) FROM ruangan_user GROUP BY user_id, ruangan_id)'
+    )
+
+    duplicate_email = op.get_bind().execute(
+        sa.text('SELECT email FROM user WHERE email IS NOT NULL GROUP BY email HAVING COUNT(*) > 1 LIMIT 1')
+    ).scalar()
+    if duplicate_email is not None:
+        raise RuntimeError(
+            f'Email {duplicate_email!r} dipakai lebih dari satu pengguna; '
+            'bereskan data tersebut sebelum menjalankan migrasi ini.'
+        )
+
+    # indeks komposit juga melayani pencarian berdasarkan user_id saja (kolom terdepan)
+    op.create_index('ix_ruangan_user_user_id_ruangan_id', 'ruangan_user', ['user_id', 'ruangan_id'], unique=True)
+    op.create_index('ix_ruangan_user_ruangan_id', 'ruangan_user', ['ruangan_id'], unique=False)
+    op.create_index('ix_user_email', 'user', ['email'], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_user_email', table_name='user')
+    op.drop_index('ix_ruangan_user_ruangan_id', table_name='ruangan_user')
+    op.drop_index('ix_ruangan_user_user_id_ruangan_id', table_name='ruangan_user')
@@ -0,0 +1,172 @@
+"""Query yang dipakai bersama oleh CLI dan web.
+
+Query yang sering dijalankan dibangun sekali saat modul dimuat, dengan
+parameter ``bindparam`` bernama. Objek statement yang sama dipakai ulang
+sehingga SQLAlchemy tidak perlu membangun query dan menghitung kunci cache
+kompilasinya di setiap panggilan; yang tersisa hanya mengikat nilai baru.
+Bentuk SQL yang berbeda (mis. hanya pengguna tanpa ruangan) menjadi statement
+terpisah.
+"""
+from __future__ import annotations
+
+from sqlalchemy import Result, Row, bindparam, exists, func, select
+from sqlalchemy.orm import Session
+
+from core import Ruangan, RuanganUser, User
+
+# pemisah GROUP_CONCAT yang tidak mungkin muncul di nama (ASCII unit separator)
+LIST_SEPARATOR = "\x1f"
+
+_not_assigned = ~exists().where(RuanganUser.user_id == User.id)
+
+_email_taken = select(User.id).where(User.email == bindparam("email")).limit(1)
+_find_assignment = select(RuanganUser).where(
+    RuanganUser.user_id == bindparam("user_id"), RuanganUser.ruangan_id == bindparam("ruangan_id")
+)
+_all_rooms = select(Ruangan).order_by(Ruangan.id)
+_all_users = select(User).order_by(User.id)
+_assignment_rows = select(
+    RuanganUser.id.label("assignment_id"),
+    RuanganUser.user_id,
+    RuanganUser.ruangan_id,
+    User.name,
+    User.email,
+).join(User, User.id == RuanganUser.user_id)
+
+_user_page = select(User).where(User.id > bindparam("after")).order_by(User.id).limit(bindparam("limit"))
+_unassigned_page = (
+    select(User).where(User.id > bindparam("after"), _not_assigned).order_by(User.id).limit(bindparam("limit"))
+)
+_room_user_page = (
+    select(RuanganUser.id.label("assignment_id"), RuanganUser.user_id, User.name, User.email)
+    .join(User, User.id == RuanganUser.user_id)
+    .where(RuanganUser.ruangan_id == bindparam("room_id"), RuanganUser.id > bindparam("after"))
+    .order_by(RuanganUser.id)
+    .limit(bindparam("limit"))
+)
+
+# jendela per ruangan diambil lewat indeks ruangan_user(ruangan_id[, id]) dengan LIMIT per ruangan,
+# jadi biayanya sebanding ruangan x jendela, bukan jumlah seluruh relasi
+_window_ids = (
+    select(RuanganUser.id)
+    .where(RuanganUser.ruangan_id == Ruangan.id)
+    .order_by(RuanganUser.id)
+    .limit(bindparam("window"))
+    .correlate(Ruangan)
+)
+_room_windows = (
+    select(
+        RuanganUser.id.label("assignment_id"),
+        RuanganUser.user_id,
+        RuanganUser.ruangan_id,
+        User.name,
+        User.email,
+    )
+    .select_from(Ruangan)
+    .join(RuanganUser, RuanganUser.id.in_(_window_ids))
+    .join(User, User.id == RuanganUser.user_id)
+    .order_by(RuanganUser.ruangan_id, RuanganUser.id)
+)
+
+_room_summaries = select(Ruangan.id, Ruangan.name, Ruangan.occupant_count).order_by(Ruangan.id)
+_user_totals = select(func.count(User.id), func.count(User.id).filter(_not_assigned))
+
+
+def email_taken(session: Session, email: str) -> bool:
+    return session.execute(_email_taken, {"email": email}).first() is not None
+
+
+def find_assignment(session: Session, user_id: int, ruangan_id: int) -> RuanganUser | None:
+    return session.scalars(_find_assignment, {"user_id": user_id, "ruangan_id": ruangan_id}).first()
+
+
+def all_rooms(session: Session) -> list[Ruangan]:
+    return session.scalars(_all_rooms).all()
+
+
+def all_users(session: Session) -> list[User]:
+    return session.scalars(_all_users).all()
+
+
+def assignment_rows(session: Session) -> list[Row]:
+    """Semua relasi beserta nama dan email penggunanya."""
+    return session.execute(_assignment_rows).all()
+
+
+def user_page(session: Session, after: int, limit: int, unassigned_only: bool = False) -> list[User]:
+    """Hingga ``limit`` pengguna dengan id > ``after`` (keyset)."""
+    statement = _unassigned_page if unassigned_only else _user_page
+    return session.scalars(statement, {"after": after, "limit": limit}).all()
+
+
+def room_user_page(session: Session, room_id: int, after: int, limit: int) -> list[Row]:
+    """Hingga ``limit`` relasi ruangan ``room_id`` dengan id > ``after`` (keyset)."""
+    return session.execute(_room_user_page, {"room_id": room_id, "after": after, "limit": limit}).all()
+
+
+def room_windows(session: Session, window: int) -> list[Row]:
+    """``window`` relasi pertama setiap ruangan dalam satu query (subquery ``LIMIT`` per ruangan)."""
+    return session.execute(_room_windows, {"window": window}).all()
+
+
+def room_summaries(session: Session) -> list[Row]:
+    return session.execute(_room_summaries).all()
+
+
+def user_totals(session: Session) -> tuple[int, int]:
+    """Jumlah seluruh pengguna dan jumlah pengguna yang belum punya ruangan."""
+    total, unassigned = session.execute(_user_totals).one()
+    return total, unassigned
+
+
+# daftar CLI dijalankan sekali per proses dan batas/offset-nya opsional, jadi cukup dibangun per panggilan
+def user_listing(session: Session, limit: int | None, offset: int, batch_size: int) -> Result:
+    """Pengguna beserta nama ruangannya (GROUP_CONCAT), dibaca bertahap per ``batch_size``."""
+    return session.execute(
+        select(User.id, User.name, User.email, func.group_concat(Ruangan.name, LIST_SEPARATOR).label("ruangan"))
+        .outerjoin(RuanganUser, RuanganUser.user_id == User.id)
+        .outerjoin(Ruangan, Ruangan.id == RuanganUser.ruangan_id)
+        .group_by(User.id)
+        .order_by(User.id)
+        .limit(limit)
+        .offset(offset)
+        .execution_options(yield_per=batch_size)
+    )
+
+
+def room_listing(session: Session, limit: int | None, offset: int, batch_size: int) -> Result:
+    """Ruangan beserta jumlah dan nama penghuninya, dibaca bertahap per ``batch_size``."""
+    return session.execute(
+        select(
+            Ruangan.id,
+            Ruangan.name,
+            Ruangan.occupant_count,
+            func.group_concat(User.name, LIST_SEPARATOR).label("penghuni"),
+        )
+        .outerjoin(RuanganUser, RuanganUser.ruangan_id == Ruangan.id)
+        .outerjoin(User, User.id == RuanganUser.user_id)
+        .group_by(Ruangan.id)
+        .order_by(Ruangan.id)
+        .limit(limit)
+        .offset(offset)
+        .execution_options(yield_per=batch_size)
+    )
+
+
+def assignment_listing(session: Session, limit: int | None, offset: int, batch_size: int) -> Result:
+    """Relasi beserta nama pengguna dan ruangan, dibaca bertahap per ``batch_size``."""
+    return session.execute(
+        select(
+            RuanganUser.id.label("assignment_id"),
+            RuanganUser.user_id,
+            RuanganUser.ruangan_id,
+            User.name.label("user_name"),
+            Ruangan.name.label("ruangan_name"),
+        )
+        .join(User, RuanganUser.user_id == User.id)
+        .join(Ruangan, RuanganUser.ruangan_id == Ruangan.id)
+        .order_by(RuanganUser.id)
+        .limit(limit)
+        .offset(offset)
+        .execution_options(yield_per=batch_size)
+    )
@@ -1,8 +1,183 @@
 from __future__ import annotations
 
-from flask import jsonify, render_template_string, request
-
+import io
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Callable, Iterable, Iterator
+
+from flask import g, jsonify, make_response, render_template_string, request, stream_with_context
+from sqlalchemy import bindparam, delete, event, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+import exporter
+import importer
+import repository
 from app import Ruangan, RuanganUser, User, app, db
+from core import pool_stats, search_users
+
+
+class BoardChangeLog:
+    """Catatan perubahan papan di memori dengan nomor versi yang selalu naik.
+
+    Versi awal diambil dari jam (mikrodetik) sehingga tetap lebih besar dari
+    versi sebelum proses dimulai ulang; klien dengan versi lama otomatis
+    diminta memuat ulang papan. Hanya perubahan lewat handler web ini yang
+    tercatat.
+    """
+
+    def __init__(self, max_entries: int = 10_000) -> None:
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._entries: deque[dict[str, object]] = deque(maxlen=max_entries)
+        self._version = time.time_ns() // 1_000
+        self._listeners: list[Callable[[dict[str, object]], None]] = []
+
+    def subscribe(self, listener: Callable[[dict[str, object]], None]) -> None:
+        """Daftarkan fungsi yang dipanggil (berurutan, di dalam lock) untuk tiap perubahan."""
+        self._listeners.append(listener)
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def record(self, kind: str, data: dict[str, object]) -> dict[str, object]:
+        with self._lock:
+            self._version += 1
+            entry = {"version": self._version, "type": kind, "data": data}
+            self._entries.append(entry)
+            for listener in self._listeners:
+                listener(entry)
+            self._changed.notify_all()
+            return entry
+
+    def since(self, version: int) -> list[dict[str, object]] | None:
+        """Perubahan setelah ``version``; ``None`` jika sudah di luar jendela log."""
+        with self._lock:
+            return self._since(version)
+
+    def wait(self, version: int, timeout: float) -> list[dict[str, object]] | None:
+        """Seperti :meth:`since`, tetapi menunggu hingga ``timeout`` detik bila belum ada perubahan."""
+        with self._changed:
+            if self._version == version:
+                self._changed.wait(timeout)
+            return self._since(version)
+
+    def _since(self, version: int) -> list[dict[str, object]] | None:
+        if version > self._version:
+            return None
+        oldest = self._entries[0]["version"] if self._entries else self._version + 1
+        if version < oldest - 1:
+            return None
+        return [entry for entry in self._entries if entry["version"] > version]
+
+
+board_changes = BoardChangeLog()
+
+
+class DataVersionStamp:
+    """Penanda perubahan database dari ``PRAGMA data_version`` pada satu koneksi khusus.
+
+    Nilainya berubah setiap kali koneksi lain (CLI, impor, worker lain, atau
+    pool proses ini sendiri) meng-commit perubahan, jadi tulisan di luar
+    :class:`BoardChangeLog` tetap terlihat. Beberapa commit di antara dua
+    pembacaan bisa terlihat sebagai satu kenaikan. Untuk database selain berkas
+    SQLite nilainya selalu ``0``.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    def current(self) -> int:
+        with self._lock:
+            if self._connection is None:
+                url = db.engine.url
+                if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+                    return 0
+                # autocommit: tanpa transaksi terbuka, setiap PRAGMA melihat commit terbaru
+                self._connection = sqlite3.connect(url.database, check_same_thread=False, isolation_level=None)
+            return self.read(self._connection)
+
+    @staticmethod
+    def read(dbapi_connection) -> int:
+        """``data_version`` sebuah koneksi DBAPI SQLite; ``0`` untuk database lain."""
+        if not isinstance(dbapi_connection, sqlite3.Connection):
+            return 0
+        return dbapi_connection.execute("PRAGMA data_version").fetchone()[0]
+
+
+db_stamp = DataVersionStamp()
+
+
+def read_session() -> Session:
+    """Session untuk endpoint baca.
+
+    Bila ``SQLITE_SPLIT_READS`` aktif, session terikat ke engine read-only
+    (bind ``reader``) dan ditutup saat app context berakhir; selain itu
+    ``db.session`` biasa.
+    """
+    if "reader" not in app.config.get("SQLALCHEMY_BINDS", {}):
+        return db.session
+    if "read_session" not in g:
+        g.read_session = Session(bind=db.engines["reader"])
+    return g.read_session
+
+
+@app.teardown_appcontext
+def close_read_session(exc: BaseException | None) -> None:
+    session = g.pop("read_session", None)
+    if session is not None:
+        session.close()
+
+
+def requested_since() -> int | None:
+    """Versi papan milik klien, dari query string ``since`` atau body JSON."""
+    data = request.get_json(silent=True) or {}
+    raw = request.args.get("since", data.get("since"))
+    if raw is None or raw == "":
+        return None
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        return None
+
+
+def changes_payload(since: int | None, own_changes: list[dict[str, object]] | None = None) -> dict[str, object]:
+    """Bentuk respons delta: perubahan sejak ``since`` atau papan penuh jika tertinggal."""
+    version = board_changes.version
+    if since is None:
+        return {"version": version, "changes": own_changes or []}
+
+    changes = board_changes.since(since)
+    if changes is None:
+        return {"reset": True}
+    return {"version": version, "changes": changes}
+
+
+def delta_response(payload: dict[str, object], status: int = 200):
+    """Kirim respons delta; papan untuk ``reset`` disambung dari JSON snapshot cache.
+
+    Bila permintaan membawa ``page_size``, papan ``reset`` berupa papan berjendela
+    seperti ``/api/board?page_size=...``, bukan papan penuh.
+    """
+    if not payload.get("reset"):
+        return jsonify(payload), status
+
+    extra = {key: value for key, value in payload.items() if key != "reset"}
+    page_size = page_size_arg()
+    if page_size is not None:
+        board = build_board_window(page_size)
+        return jsonify({"board": board, "reset": True, **extra, "version": board["version"]}), status
+
+    version, _, board_body = board_cache.snapshot()
+    extra_body = app.json.dumps(extra)[1:-1]
+    body = b'{"board":' + board_body + b',"reset":true,"version":%d' % version
+    if extra_body:
+        body += b"," + extra_body.encode()
+    return app.response_class(body + b"}", status=status, mimetype="application/json")
 
 
 def serialize_user(user: User) -> dict[str, str | int]:
@@ -13,23 +188,16 @@ def serialize_user(user: User) -> dict[str, str | int]:
     }
 
 
-def build_board_payload() -> dict[str, list[dict[str, str | int]]]:
-    rooms = Ruangan.query.order_by(Ruangan.id).all()
-    users = User.query.order_by(User.id).all()
+def build_board_payload() -> dict[str, object]:
+    # versi dibaca sebelum query agar klien paling buruk menerima ulang perubahan, bukan kehilangan
+    version = board_changes.version
+    session = read_session()
+    rooms = repository.all_rooms(session)
+    users = repository.all_users(session)
 
     palette = [serialize_user(user) for user in users]
 
-    assignment_rows = (
-        db.session.query(
-            RuanganUser.id.label("assignment_id"),
-            RuanganUser.user_id,
-            RuanganUser.ruangan_id,
-            User.name,
-            User.email,
-        )
-        .join(User, User.id == RuanganUser.user_id)
-        .all()
-    )
+    assignment_rows = repository.assignment_rows(session)
 
     room_map: dict[int, dict[str, object]] = {
         room.id: {"id": room.id, "name": room.name, "users": []}
@@ -55,12 +223,367 @@ def build_board_payload() -> dict[str, list[dict[str, str | int]]]:
     unassigned = [serialize_user(user) for user in users if user.id not in assigned_user_ids]
 
     return {
+        "version": version,
         "palette": palette,
         "unassigned": unassigned,
         "rooms": list(room_map.values()),
     }
 
 
+def assignment_entry(row) -> dict[str, str | int]:
+    return {
+        "assignment_id": row.assignment_id,
+        "user_id": row.user_id,
+        "name": row.name,
+        "email": row.email,
+    }
+
+
+def page_size_arg(name: str = "page_size") -> int | None:
+    """Ukuran halaman dari query string, dibatasi ``BOARD_MAX_PAGE_SIZE``."""
+    size = request.args.get(name, type=int)
+    if size is None:
+        return None
+    return max(1, min(size, app.config.get("BOARD_MAX_PAGE_SIZE", 1000)))
+
+
+def keyset_page(items: list[dict[str, object]], limit: int, key: str) -> tuple[list[dict[str, object]], int | None]:
+    """Potong hasil ``limit + 1`` baris menjadi satu halaman dan kursor berikutnya."""
+    if len(items) > limit:
+        items = items[:limit]
+        return items, items[-1][key]
+    return items, None
+
+
+def user_page(after: int, limit: int, unassigned_only: bool = False) -> tuple[list[dict[str, object]], int | None]:
+    users = repository.user_page(read_session(), after, limit + 1, unassigned_only)
+    return keyset_page([serialize_user(user) for user in users], limit, "id")
+
+
+def room_user_page(room_id: int, after: int, limit: int) -> tuple[list[dict[str, object]], int | None]:
+    rows = repository.room_user_page(read_session(), room_id, after, limit + 1)
+    return keyset_page([assignment_entry(row) for row in rows], limit, "assignment_id")
+
+
+def build_board_window(page_size: int) -> dict[str, object]:
+    """Papan dengan setiap kolom dibatasi ``page_size`` entri plus kursor keyset-nya."""
+    version = board_changes.version
+    rooms = repository.all_rooms(read_session())
+
+    palette, palette_cursor = user_page(0, page_size)
+    unassigned, unassigned_cursor = user_page(0, page_size, unassigned_only=True)
+
+    # satu query untuk halaman pertama semua ruangan: nomori relasi per ruangan lalu potong
+    rows = repository.room_windows(read_session(), page_size + 1)
+
+    room_rows: dict[int, list[dict[str, object]]] = {room.id: [] for room in rooms}
+    for row in rows:
+        if row.ruangan_id in room_rows:
+            room_rows[row.ruangan_id].append(assignment_entry(row))
+
+    room_entries = []
+    for room in rooms:
+        users, cursor = keyset_page(room_rows[room.id], page_size, "assignment_id")
+        room_entries.append(
+            {
+                "id": room.id,
+                "name": room.name,
+                "count": room.occupant_count,
+                "users": users,
+                "next_cursor": cursor,
+            }
+        )
+
+    return {
+        "version": version,
+        "page_size": page_size,
+        "palette": palette,
+        "palette_cursor": palette_cursor,
+        "unassigned": unassigned,
+        "unassigned_cursor": unassigned_cursor,
+        "rooms": room_entries,
+    }
+
+
+def build_board_summary() -> dict[str, object]:
+    """Ringkasan papan: hanya jumlah penghuni per ruangan, dibaca dari ``ruangan`` saja."""
+    version = board_changes.version
+    session = read_session()
+    rooms = repository.room_summaries(session)
+    user_count, unassigned_count = repository.user_totals(session)
+    return {
+        "version": version,
+        "user_count": user_count,
+        "unassigned_count": unassigned_count,
+        "rooms": [{"id": room.id, "name": room.name, "count": room.occupant_count} for room in rooms],
+    }
+
+
+def json_items(items: Iterable[dict[str, object]], batch_size: int) -> Iterator[str]:
+    """Serialisasi elemen array JSON satu per satu, dikirim per ``batch_size`` elemen."""
+    buffer: list[str] = []
+    separator = ""
+    for item in items:
+        buffer.append(app.json.dumps(item))
+        if len(buffer) >= batch_size:
+            yield separator + ", ".join(buffer)
+            separator, buffer = ", ", []
+    if buffer:
+        yield separator + ", ".join(buffer)
+
+
+def stream_board_json(batch_size: int = 1000) -> Iterator[str]:
+    """Tulis payload papan penuh secara bertahap dengan kursor ``yield_per``.
+
+    Bentuknya sama dengan :func:`build_board_payload`, tetapi tidak pernah
+    menyimpan lebih dari satu batch baris di memori.
+    """
+    version = board_changes.version
+    session = read_session()
+    user_columns = select(User.id, User.name, User.email).order_by(User.id).execution_options(yield_per=batch_size)
+    not_assigned = ~select(RuanganUser.id).where(RuanganUser.user_id == User.id).exists()
+
+    def user_rows(statement) -> Iterator[dict[str, object]]:
+        for row in session.execute(statement):
+            yield {"id": row.id, "name": row.name, "email": row.email}
+
+    yield '{"version": %d, "palette": [' % version
+    yield from json_items(user_rows(user_columns), batch_size)
+    yield '], "unassigned": ['
+    yield from json_items(user_rows(user_columns.where(not_assigned)), batch_size)
+    yield '], "rooms": ['
+
+    rooms = session.execute(
+        select(Ruangan.id, Ruangan.name).order_by(Ruangan.id).execution_options(yield_per=batch_size)
+    )
+    assignments = iter(
+        session.execute(
+            select(
+                RuanganUser.id.label("assignment_id"),
+                RuanganUser.user_id,
+                RuanganUser.ruangan_id,
+                User.name,
+                User.email,
+            )
+            .join(User, User.id == RuanganUser.user_id)
+            .order_by(RuanganUser.ruangan_id, RuanganUser.id)
+            .execution_options(yield_per=batch_size)
+        )
+    )
+    pending = next(assignments, None)
+
+    def room_users(room_id: int) -> Iterator[dict[str, object]]:
+        # gabungkan dua kursor yang sama-sama terurut berdasarkan id ruangan
+        nonlocal pending
+        while pending is not None and (pending.ruangan_id is None or pending.ruangan_id <= room_id):
+            if pending.ruangan_id == room_id:
+                yield assignment_entry(pending)
+            pending = next(assignments, None)
+
+    separator = ""
+    for room in rooms:
+        yield separator + '{"id": %d, "name": %s, "users": [' % (room.id, app.json.dumps(room.name))
+        yield from json_items(room_users(room.id), batch_size)
+        yield "]}"
+        separator = ", "
+    yield "]}"
+
+
+class BoardSnapshotCache:
+    """Snapshot papan terakhir beserta JSON-nya, diperbarui langsung dari log perubahan.
+
+    Mutasi yang dikenali diterapkan ke snapshot di memori tanpa query ulang;
+    selebihnya cukup membuang snapshot. Snapshot juga dibuang bila
+    :data:`db_stamp` berubah oleh tulisan di luar handler web (CLI, impor,
+    worker lain), kedaluwarsa setelah ``ttl`` detik, dan tidak disimpan bila
+    JSON-nya melebihi ``max_bytes``.
+    """
+
+    def __init__(self, ttl: float = 30.0, max_bytes: int = 16 * 1024 * 1024) -> None:
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._payload: dict[str, object] | None = None
+        self._body: bytes | None = None
+        self._stamp = 0
+        self._built_at = 0.0
+        # stamp sebelum/sesudah commit terakhir di thread ini, untuk apply() berikutnya
+        self._commits = threading.local()
+        self.hits = 0
+        self.misses = 0
+        self.patches = 0
+        self.invalidations = 0
+        self.oversize = 0
+
+    def snapshot(self) -> tuple[int, int, bytes]:
+        """Kembalikan ``(versi, stamp, json_bytes)`` papan, membangun ulang bila perlu."""
+        with self._lock:
+            stamp = db_stamp.current()
+            if (
+                self._payload is not None
+                and self._payload["version"] == board_changes.version
+                and self._stamp == stamp
+                and time.monotonic() - self._built_at < self.ttl
+            ):
+                self.hits += 1
+                if self._body is None:
+                    self._body = app.json.dumps(self._payload).encode()
+                return self._payload["version"], self._stamp, self._body
+            self.misses += 1
+
+        # stamp dibaca sebelum query: tulisan selama query berjalan membuat snapshot basi, bukan sebaliknya
+        payload = build_board_payload()
+        body = app.json.dumps(payload).encode()
+        with self._lock:
+            # simpan hanya jika tidak ada mutasi selama query berjalan
+            if len(body) > self.max_bytes:
+                self.oversize += 1
+                self._payload = self._body = None
+            elif payload["version"] == board_changes.version:
+                self._payload, self._body, self._stamp = payload, body, stamp
+                self._built_at = time.monotonic()
+        return payload["version"], stamp, body
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._drop()
+
+    def before_commit(self, connection) -> None:
+        """Listener ``commit`` engine penulis, dipanggil tepat sebelum commit.
+
+        Snapshot dibuang bila database sudah berubah sejak snapshot dibuat atau
+        terakhir dipatch. Stamp saat ini dan ``data_version`` koneksi penulis
+        sendiri disimpan untuk :meth:`after_commit`.
+        """
+        # data_version koneksi penulis dibaca lebih dulu: commit luar di antara kedua
+        # pembacaan sudah ikut di stamp dan membuang snapshot di bawah
+        own = DataVersionStamp.read(connection.connection.dbapi_connection)
+        stamp = db_stamp.current()
+        with self._lock:
+            if self._payload is not None and self._stamp != stamp:
+                self._drop()
+        connection.info["board_stamp"] = (stamp, own)
+
+    def after_commit(self, dbapi_connection, connection_record) -> None:
+        """Listener ``checkin`` pool penulis: stamp sesudah commit, bila hanya commit ini yang terjadi.
+
+        ``data_version`` koneksi penulis tidak berubah oleh commit-nya sendiri,
+        hanya oleh commit koneksi lain. Karena dibaca sesudah stamp, nilai yang
+        masih sama membuktikan stamp baru hanya memuat commit ini; bila berbeda,
+        :meth:`apply` membuang snapshot alih-alih menyerap tulisan luar itu.
+        """
+        pending = connection_record.info.pop("board_stamp", None)
+        if pending is None:
+            return
+        before, own = pending
+        after = db_stamp.current()
+        clean = DataVersionStamp.read(dbapi_connection) == own
+        self._commits.last = (before, after if clean else None)
+
+    def _drop(self) -> None:
+        if self._payload is not None:
+            self.invalidations += 1
+        self._payload = self._body = None
+
+    def apply(self, change: dict[str, object]) -> None:
+        # perubahan dicatat di thread yang sama, tepat setelah commit-nya
+        before, after = getattr(self._commits, "last", None) or (None, None)
+        self._commits.last = None
+        with self._lock:
+            payload = self._payload
+            if payload is None:
+                return
+            if (
+                payload["version"] != change["version"] - 1
+                or after is None
+                or self._stamp != before
+                or not self._patch(payload, change)
+            ):
+                self._drop()
+                return
+            payload["version"] = change["version"]
+            self._body = None
+            self._stamp = after
+            self.patches += 1
+
+    @staticmethod
+    def _patch(payload: dict[str, object], change: dict[str, object]) -> bool:
+        # setiap patch idempoten: snapshot yang dibangun tepat setelah commit
+        # mungkin sudah memuat perubahan yang baru dicatat sesudahnya
+        kind = change["type"]
+        data = change["data"]
+        rooms: list[dict[str, object]] = payload["rooms"]
+        palette: list[dict[str, object]] = payload["palette"]
+
+        if kind == "user.added":
+            if not any(user["id"] == data["id"] for user in palette):
+                palette.append(dict(data))
+        elif kind == "user.removed":
+            payload["palette"] = [user for user in palette if user["id"] != data["id"]]
+            for room in rooms:
+                room["users"] = [user for user in room["users"] if user["user_id"] != data["id"]]
+        elif kind == "room.added":
+            if not any(room["id"] == data["id"] for room in rooms):
+                rooms.append({"id": data["id"], "name": data["name"], "users": []})
+        elif kind == "room.removed":
+            payload["rooms"] = [room for room in rooms if room["id"] != data["id"]]
+        elif kind in ("assignment.added", "assignment.moved", "assignment.removed"):
+            entry = None
+            for room in rooms:
+                for user in room["users"]:
+                    if user["assignment_id"] == data["assignment_id"]:
+                        entry = user
+                        room["users"].remove(user)
+                        break
+            if kind != "assignment.removed":
+                target = next((room for room in rooms if room["id"] == data["ruangan_id"]), None)
+                if target is None:
+                    return False
+                target["users"].append(
+                    entry
+                    or {
+                        "assignment_id": data["assignment_id"],
+                        "user_id": data["user_id"],
+                        "name": data["name"],
+                        "email": data["email"],
+                    }
+                )
+        else:
+            return False
+
+        assigned = {user["user_id"] for room in payload["rooms"] for user in room["users"]}
+        payload["unassigned"] = [user for user in payload["palette"] if user["id"] not in assigned]
+        return True
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "patches": self.patches,
+                "invalidations": self.invalidations,
+                "oversize": self.oversize,
+                "cached": self._payload is not None,
+                "cached_version": self._payload["version"] if self._payload else None,
+                "cached_stamp": self._stamp if self._payload else None,
+                "cached_bytes": len(self._body) if self._body is not None else None,
+                "ttl": self.ttl,
+                "max_bytes": self.max_bytes,
+            }
+
+
+board_cache = BoardSnapshotCache(
+    ttl=app.config.get("BOARD_CACHE_TTL", 30.0),
+    max_bytes=app.config.get("BOARD_CACHE_MAX_BYTES", 16 * 1024 * 1024),
+)
+board_changes.subscribe(board_cache.apply)
+with app.app_context():
+    event.listen(db.engine, "commit", board_cache.before_commit)
+    event.listen(db.engine.pool, "checkin", board_cache.after_commit)
+
+
 @app.get("/")
 def index():
     return render_template_string(
@@ -211,6 +734,13 @@ def index():
                     flex-direction: column;
                     gap: 10px;
                     min-height: 60px;
+                    max-height: 60vh;
+                    overflow-y: auto;
+                }
+                .column h3 .count {
+                    font-size: 0.8rem;
+                    font-weight: 600;
+                    color: #6366f1;
                 }
                 .user-card {
                     cursor: grab;
@@ -421,13 +951,218 @@ def index():
                 const modalEl = document.getElementById('modal');
                 const modalBackdrop = document.getElementById('modal-backdrop');
 
+                const PAGE_SIZE = 100;
+                const state = {
+                    version: null,
+                    users: new Map(),
+                    rooms: new Map(),
+                    columns: new Map(),
+                };
+
+                let boardStream = null;
+
                 async function fetchBoard() {
-                    const response = await fetch('/api/board');
+                    const response = await fetch(`/api/board?page_size=${PAGE_SIZE}`);
                     if (!response.ok) {
                         throw new Error('Gagal memuat data papan.');
                     }
                     const data = await response.json();
-                    renderBoard(data);
+                    loadBoard(data);
+                    renderBoard();
+                    openBoardStream();
+                }
+
+                function openBoardStream() {
+                    if (boardStream) {
+                        boardStream.close();
+                    }
+                    boardStream = new EventSource(`/api/board/stream?since=${state.version}`);
+                    boardStream.onmessage = event => {
+                        const change = JSON.parse(event.data);
+                        if (change.version > state.version) {
+                            applyDelta({ version: change.version, changes: [change] });
+                        }
+                    };
+                    boardStream.addEventListener('reset', () => {
+                        boardStream.close();
+                        boardStream = null;
+                        fetchBoard().catch(error => console.error(error));
+                    });
+                }
+
+                function createColumnState(cursor = null, roomId = null) {
+                    return { items: new Map(), cursor: cursor ?? null, roomId, loading: false };
+                }
+
+                function rememberUser(user) {
+                    const id = user.id ?? user.user_id;
+                    state.users.set(id, { id, name: user.name, email: user.email });
+                    return id;
+                }
+
+                function loadBoard(data) {
+                    state.version = data.version;
+                    state.users = new Map();
+                    state.rooms = new Map();
+                    state.columns = new Map();
+
+                    const palette = createColumnState(data.palette_cursor);
+                    data.palette.forEach(user => palette.items.set(rememberUser(user), { user_id: user.id }));
+                    state.columns.set('palette', palette);
+
+                    const unassigned = createColumnState(data.unassigned_cursor);
+                    data.unassigned.forEach(user => unassigned.items.set(rememberUser(user), { user_id: user.id }));
+                    state.columns.set('unassigned', unassigned);
+
+                    data.rooms.forEach(room => {
+                        state.rooms.set(room.id, { id: room.id, name: room.name, count: room.count ?? room.users.length });
+                        const column = createColumnState(room.next_cursor, room.id);
+                        room.users.forEach(user => {
+                            rememberUser(user);
+                            column.items.set(user.assignment_id, { user_id: user.user_id, assignment_id: user.assignment_id });
+                        });
+                        state.columns.set(`room-${room.id}`, column);
+                    });
+                }
+
+                // kolom yang belum dimuat penuh hanya menerima kunci di dalam jendela kursornya;
+                // kunci yang lebih besar akan datang sendiri lewat halaman berikutnya
+                function inWindow(column, key) {
+                    return column.cursor === null || key <= column.cursor;
+                }
+
+                function roomColumns() {
+                    return [...state.columns.values()].filter(column => column.roomId !== null);
+                }
+
+                function markUnassigned(userId) {
+                    const assigned = roomColumns().some(column =>
+                        [...column.items.values()].some(item => item.user_id === userId));
+                    const unassigned = state.columns.get('unassigned');
+                    if (!assigned && inWindow(unassigned, userId)) {
+                        unassigned.items.set(userId, { user_id: userId });
+                    }
+                }
+
+                function adjustCount(roomId, delta) {
+                    const room = state.rooms.get(roomId);
+                    if (room) room.count = Math.max(0, room.count + delta);
+                }
+
+                function applyChange(change) {
+                    const data = change.data;
+                    switch (change.type) {
+                        case 'user.added': {
+                            rememberUser(data);
+                            ['palette', 'unassigned'].forEach(listId => {
+                                const column = state.columns.get(listId);
+                                if (inWindow(column, data.id)) column.items.set(data.id, { user_id: data.id });
+                            });
+                            break;
+                        }
+                        case 'user.removed':
+                            state.users.delete(data.id);
+                            state.columns.get('palette').items.delete(data.id);
+                            state.columns.get('unassigned').items.delete(data.id);
+                            roomColumns().forEach(column => {
+                                column.items.forEach((item, key) => {
+                                    if (item.user_id === data.id) {
+                                        column.items.delete(key);
+                                        adjustCount(column.roomId, -1);
+                                    }
+                                });
+                            });
+                            break;
+                        case 'room.added':
+                            state.rooms.set(data.id, { id: data.id, name: data.name, count: 0 });
+                            state.columns.set(`room-${data.id}`, createColumnState(null, data.id));
+                            break;
+                        case 'room.removed': {
+                            const column = state.columns.get(`room-${data.id}`);
+                            state.rooms.delete(data.id);
+                            state.columns.delete(`room-${data.id}`);
+                            if (column) column.items.forEach(item => markUnassigned(item.user_id));
+                            break;
+                        }
+                        case 'assignment.added':
+                        case 'assignment.moved':
+                        case 'assignment.removed': {
+                            rememberUser(data);
+                            roomColumns().forEach(column => column.items.delete(data.assignment_id));
+                            if (change.type !== 'assignment.added') adjustCount(data.from_ruangan_id, -1);
+                            if (change.type === 'assignment.removed') {
+                                markUnassigned(data.user_id);
+                                break;
+                            }
+                            adjustCount(data.ruangan_id, 1);
+                            state.columns.get('unassigned').items.delete(data.user_id);
+                            const target = state.columns.get(`room-${data.ruangan_id}`);
+                            if (target && inWindow(target, data.assignment_id)) {
+                                target.items.set(data.assignment_id, { user_id: data.user_id, assignment_id: data.assignment_id });
+                            }
+                            break;
+                        }
+                    }
+                }
+
+                function applyDelta(data) {
+                    if (!data.reset && (data.changes || []).some(change => change.type === 'board.reloaded')) {
+                        // perubahan massal (mis. impor) tidak dikirim per baris; muat ulang papan
+                        fetchBoard().catch(error => console.error(error));
+                        return;
+                    }
+                    if (data.reset) {
+                        loadBoard(data.board);
+                    } else {
+                        (data.changes || []).forEach(change => {
+                            if (state.version === null || change.version > state.version) {
+                                applyChange(change);
+                            }
+                        });
+                        state.version = data.version;
+                    }
+                    renderBoard();
+                }
+
+                async function sendMutation(url, options = {}, fallbackMessage = 'Permintaan gagal.') {
+                    const separator = url.includes('?') ? '&' : '?';
+                    const response = await fetch(`${url}${separator}since=${state.version ?? ''}&page_size=${PAGE_SIZE}`, options);
+                    const data = await response.json().catch(() => ({}));
+                    if (!response.ok) {
+                        throw new Error(data.message || fallbackMessage);
+                    }
+                    applyDelta(data);
+                    return data;
+                }
+
+                async function loadMore(listId, list) {
+                    const column = state.columns.get(listId);
+                    if (!column || column.cursor === null || column.loading) {
+                        return;
+                    }
+                    const url = column.roomId !== null ? `/api/board/rooms/${column.roomId}/users` : `/api/board/${listId}`;
+                    column.loading = true;
+                    try {
+                        const response = await fetch(`${url}?after=${column.cursor}&limit=${PAGE_SIZE}`);
+                        if (!response.ok) {
+                            throw new Error('Gagal memuat data berikutnya.');
+                        }
+                        const data = await response.json();
+                        data.users.forEach(user => {
+                            const userId = rememberUser(user);
+                            const key = user.assignment_id ?? userId;
+                            if (!column.items.has(key)) {
+                                column.items.set(key, { user_id: userId, assignment_id: user.assignment_id ?? null });
+                                list.appendChild(createUserCard(state.users.get(userId), user.assignment_id ?? null));
+                            }
+                        });
+                        column.cursor = data.next_cursor;
+                    } catch (error) {
+                        console.error(error);
+                        showToast(error.message, true);
+                    } finally {
+                        column.loading = false;
+                    }
                 }
 
                 function openModal() {
@@ -442,24 +1177,52 @@ def index():
                     document.body.classList.remove('modal-open');
                 }
 
-                function renderBoard(data) {
+                function columnUsers(listId) {
+                    const column = state.columns.get(listId);
+                    return [...column.items.entries()]
+                        .sort((left, right) => left[0] - right[0])
+                        .map(([, item]) => ({ ...state.users.get(item.user_id), assignment_id: item.assignment_id ?? null }))
+                        .filter(user => user.id !== undefined);
+                }
+
+                function renderBoard() {
+                    const scrollPositions = new Map(
+                        [...document.querySelectorAll('.user-list')].map(list => [list.id, list.scrollTop]));
                     boardEl.innerHTML = '';
                     paletteList.innerHTML = '';
-                    data.palette.forEach(user => {
+                    columnUsers('palette').forEach(user => {
                         paletteList.appendChild(createUserCard(user));
                     });
-                    boardEl.appendChild(createColumn('Belum Ter-assign', 'unassigned', data.unassigned));
-                    data.rooms.forEach(room => {
-                        boardEl.appendChild(createColumn(room.name, `room-${room.id}`, room.users, room.id));
+                    watchScroll(paletteList);
+                    boardEl.appendChild(createColumn('Belum Ter-assign', 'unassigned', columnUsers('unassigned')));
+                    state.rooms.forEach(room => {
+                        boardEl.appendChild(createColumn(room.name, `room-${room.id}`, columnUsers(`room-${room.id}`), room.id, room.count));
+                    });
+                    document.querySelectorAll('.user-list').forEach(list => {
+                        list.scrollTop = scrollPositions.get(list.id) ?? 0;
                     });
                     initDragAndDrop();
                 }
 
-                function createColumn(title, listId, users, roomId = null) {
+                function watchScroll(list) {
+                    list.onscroll = () => {
+                        if (list.scrollTop + list.clientHeight >= list.scrollHeight - 80) {
+                            loadMore(list.id, list);
+                        }
+                    };
+                }
+
+                function createColumn(title, listId, users, roomId = null, count = null) {
                     const column = document.createElement('div');
                     column.className = 'column';
                     const heading = document.createElement('h3');
                     heading.textContent = title;
+                    if (count !== null) {
+                        const badge = document.createElement('small');
+                        badge.className = 'count';
+                        badge.textContent = String(count);
+                        heading.appendChild(badge);
+                    }
                     const list = document.createElement('ul');
                     list.className = 'user-list';
                     list.id = listId;
@@ -468,6 +1231,7 @@ def index():
                     users.forEach(user => {
                         list.appendChild(createUserCard(user, user.assignment_id ?? null));
                     });
+                    watchScroll(list);
 
                     column.appendChild(heading);
                     column.appendChild(list);
@@ -549,7 +1313,7 @@ def index():
                     }
 
                     try {
-                        const response = await fetch('/api/assign', {
+                        await sendMutation('/api/assign', {
                             method: 'POST',
                             headers: { 'Content-Type': 'application/json' },
                             body: JSON.stringify({
@@ -557,12 +1321,7 @@ def index():
                                 ruangan_id: targetRoom,
                                 assignment_id: assignmentId,
                             }),
-                        });
-                        if (!response.ok) {
-                            throw new Error('Gagal memperbarui penempatan.');
-                        }
-                        const data = await response.json();
-                        renderBoard(data);
+                        }, 'Gagal memperbarui penempatan.');
                         showToast('Penempatan berhasil disimpan.');
                     } catch (error) {
                         console.error(error);
@@ -606,18 +1365,13 @@ def index():
                     const formData = new FormData(userForm);
                     const payload = Object.fromEntries(formData.entries());
                     try {
-                        const response = await fetch('/api/users', {
+                        await sendMutation('/api/users', {
                             method: 'POST',
                             headers: { 'Content-Type': 'application/json' },
                             body: JSON.stringify(payload),
-                        });
-                        if (!response.ok) {
-                            const error = await response.json().catch(() => ({}));
-                            throw new Error(error.message || 'Gagal menambah pengguna.');
-                        }
+                        }, 'Gagal menambah pengguna.');
                         userForm.reset();
                         closeModal();
-                        await fetchBoard();
                         showToast('Pengguna baru ditambahkan.');
                     } catch (error) {
                         console.error(error);
@@ -630,18 +1384,13 @@ def index():
                     const formData = new FormData(roomForm);
                     const payload = Object.fromEntries(formData.entries());
                     try {
-                        const response = await fetch('/api/rooms', {
+                        await sendMutation('/api/rooms', {
                             method: 'POST',
                             headers: { 'Content-Type': 'application/json' },
                             body: JSON.stringify(payload),
-                        });
-                        if (!response.ok) {
-                            const error = await response.json().catch(() => ({}));
-                            throw new Error(error.message || 'Gagal menambah ruangan.');
-                        }
+                        }, 'Gagal menambah ruangan.');
                         roomForm.reset();
                         closeModal();
-                        await fetchBoard();
                         showToast('Ruangan baru ditambahkan.');
                     } catch (error) {
                         console.error(error);
@@ -660,9 +1409,113 @@ def index():
     )
 
 
+def board_etag(version: int, stamp: int) -> str:
+    return f"board-{version}-{stamp}"
+
+
 @app.get("/api/board")
 def api_board():
-    return jsonify(build_board_payload())
+    # ETag dari versi di memori plus data_version database: 304 tidak menyentuh tabel,
+    # tetapi tulisan di luar handler web (CLI, impor, worker lain) tetap mengganti ETag
+    stamp = db_stamp.current()
+    etag = board_etag(board_changes.version, stamp)
+    page_size = page_size_arg()
+    if request.if_none_match.contains(etag):
+        response = make_response("", 304)
+        response.set_etag(etag)
+    elif request.args.get("summary") in ("1", "true"):
+        payload = build_board_summary()
+        response = jsonify(payload)
+        response.set_etag(board_etag(payload["version"], stamp))
+    elif page_size is not None:
+        payload = build_board_window(page_size)
+        response = jsonify(payload)
+        response.set_etag(board_etag(payload["version"], stamp))
+    elif request.args.get("stream") in ("1", "true"):
+        response = app.response_class(stream_with_context(stream_board_json()), mimetype="application/json")
+        response.set_etag(etag)
+    else:
+        version, stamp, body = board_cache.snapshot()
+        response = app.response_class(body, mimetype="application/json")
+        response.set_etag(board_etag(version, stamp))
+    response.cache_control.no_cache = True
+    return response
+
+
+def column_page_response(items: list[dict[str, object]], cursor: int | None):
+    return jsonify({"version": board_changes.version, "users": items, "next_cursor": cursor})
+
+
+@app.get("/api/board/palette")
+def api_board_palette():
+    limit = page_size_arg("limit") or app.config.get("BOARD_PAGE_SIZE", 100)
+    return column_page_response(*user_page(request.args.get("after", 0, type=int), limit))
+
+
+@app.get("/api/board/unassigned")
+def api_board_unassigned():
+    limit = page_size_arg("limit") or app.config.get("BOARD_PAGE_SIZE", 100)
+    return column_page_response(*user_page(request.args.get("after", 0, type=int), limit, unassigned_only=True))
+
+
+@app.get("/api/board/rooms/<int:room_id>/users")
+def api_board_room_users(room_id: int):
+    if read_session().get(Ruangan, room_id) is None:
+        return jsonify({"message": "Ruangan tidak ditemukan"}), 404
+    limit = page_size_arg("limit") or app.config.get("BOARD_PAGE_SIZE", 100)
+    return column_page_response(*room_user_page(room_id, request.args.get("after", 0, type=int), limit))
+
+
+@app.get("/api/board/cache")
+def api_board_cache():
+    return jsonify(board_cache.stats())
+
+
+@app.get("/api/db/pools")
+def api_db_pools():
+    """Lama menunggu koneksi di pool penulis dan pembaca."""
+    return jsonify({"split_reads": app.config["SQLITE_SPLIT_READS"], "pools": pool_stats()})
+
+
+@app.get("/api/board/changes")
+def api_board_changes():
+    since = requested_since()
+    if since is None:
+        return jsonify({"message": "Parameter since wajib diisi"}), 400
+    return delta_response(changes_payload(since))
+
+
+@app.get("/api/board/stream")
+def api_board_stream():
+    # EventSource mengirim Last-Event-ID sendiri saat tersambung ulang
+    last_event_id = request.headers.get("Last-Event-ID") or request.args.get("since")
+    try:
+        since = int(last_event_id) if last_event_id else board_changes.version
+    except ValueError:
+        since = board_changes.version
+    keepalive = app.config.get("BOARD_STREAM_KEEPALIVE", 15.0)
+
+    def generate():
+        version = since
+        yield "retry: 3000\n\n"
+        while True:
+            changes = board_changes.wait(version, keepalive)
+            if changes is None:
+                # klien terlalu tertinggal: minta ia memuat ulang papan lalu membuka stream baru
+                yield f"event: reset\ndata: {app.json.dumps({'version': board_changes.version})}\n\n"
+                return
+            if not changes:
+                yield ": keep-alive\n\n"
+                continue
+            for change in changes:
+                yield f"id: {change['version']}\ndata: {app.json.dumps(change)}\n\n"
+                version = change["version"]
+
+    return app.response_class(
+        generate(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.post("/api/assign")
@@ -671,46 +1524,254 @@ def api_assign():
     user_id = data.get("user_id")
     room_id = data.get("ruangan_id")
     assignment_id = data.get("assignment_id")
+    since = requested_since()
 
     if user_id is None:
         return jsonify({"message": "user_id wajib diisi"}), 400
 
-    user = User.query.get(user_id)
+    user = db.session.get(User, user_id)
     if user is None:
         return jsonify({"message": "Pengguna tidak ditemukan"}), 404
 
     if assignment_id is not None:
-        assignment = RuanganUser.query.get(assignment_id)
+        assignment = db.session.get(RuanganUser, assignment_id)
         if assignment is None:
             return jsonify({"message": "Relasi tidak ditemukan"}), 404
 
+        owner = user if assignment.user_id == user.id else db.session.get(User, assignment.user_id)
+        change = {
+            "assignment_id": assignment.id,
+            "user_id": assignment.user_id,
+            "name": owner.name if owner else None,
+            "email": owner.email if owner else None,
+            "ruangan_id": room_id,
+            "from_ruangan_id": assignment.ruangan_id,
+        }
         if room_id is None:
             db.session.delete(assignment)
+            kind = "assignment.removed"
         else:
-            room = Ruangan.query.get(room_id)
+            room = db.session.get(Ruangan, room_id)
             if room is None:
                 return jsonify({"message": "Ruangan tidak ditemukan"}), 404
+            existing = repository.find_assignment(db.session, assignment.user_id, room.id)
+            if existing is not None and existing.id != assignment.id:
+                return jsonify({"message": "Pengguna sudah berada di ruangan tujuan"}), 409
             assignment.ruangan_id = room.id
-        db.session.commit()
-        return jsonify(build_board_payload())
+            kind = "assignment.moved"
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # permintaan lain menempatkan pengguna yang sama ke ruangan itu lebih dulu
+            db.session.rollback()
+            return jsonify({"message": "Pengguna sudah berada di ruangan tujuan"}), 409
+        entry = board_changes.record(kind, change)
+        return delta_response(changes_payload(since, [entry]))
 
     # assignment_id tidak disediakan -> buat relasi baru jika ada ruangan
     if room_id is None:
-        return jsonify(build_board_payload())
+        return delta_response(changes_payload(since))
 
-    room = Ruangan.query.get(room_id)
+    room = db.session.get(Ruangan, room_id)
     if room is None:
         return jsonify({"message": "Ruangan tidak ditemukan"}), 404
 
-    existing = RuanganUser.query.filter_by(user_id=user.id, ruangan_id=room.id).first()
-    if existing is None:
-        assignment = RuanganUser(user_id=user.id, ruangan_id=room.id)
-        db.session.add(assignment)
-        db.session.commit()
-    else:
+    assignment_id = RuanganUser.create_if_absent(db.session, user.id, room.id)
+    if assignment_id is None:
+        # relasi sudah ada; tidak ada yang perlu di-commit
+        return delta_response(changes_payload(since))
+    db.session.commit()
+
+    change = {
+        "assignment_id": assignment_id,
+        "user_id": user.id,
+        "name": user.name,
+        "email": user.email,
+        "ruangan_id": room.id,
+    }
+    entry = board_changes.record("assignment.added", change)
+    return delta_response(changes_payload(since, [entry]))
+
+
+def is_optional_id(value: object) -> bool:
+    return value is None or (isinstance(value, int) and not isinstance(value, bool))
+
+
+@app.post("/api/assign/batch")
+def api_assign_batch():
+    data = request.get_json(silent=True) or {}
+    operations = data.get("operations")
+    since = requested_since()
+
+    if not isinstance(operations, list) or not all(isinstance(op, dict) for op in operations):
+        return jsonify({"message": "operations wajib berupa daftar objek"}), 400
+    if len(operations) > app.config.get("ASSIGN_BATCH_MAX", 5000):
+        return jsonify({"message": "Jumlah operasi melebihi batas"}), 400
+
+    # id harus bilangan bulat atau null sebelum dimasukkan ke himpunan di bawah
+    invalid = {
+        index
+        for index, op in enumerate(operations)
+        if not all(is_optional_id(op.get(key)) for key in ("user_id", "ruangan_id", "assignment_id"))
+    }
+    checked = [op for index, op in enumerate(operations) if index not in invalid]
+
+    # validasi berbasis himpunan: satu query IN per tabel
+    user_ids = {op["user_id"] for op in checked if op.get("user_id") is not None}
+    room_ids = {op["ruangan_id"] for op in checked if op.get("ruangan_id") is not None}
+    assignment_ids = {op["assignment_id"] for op in checked if op.get("assignment_id") is not None}
+
+    # semua relasi milik pengguna yang disebut maupun pemilik relasi yang dipindah,
+    # supaya pemindahan ke ruangan yang sudah ditempati pemiliknya ikut terdeteksi
+    owner_ids = select(RuanganUser.user_id).where(RuanganUser.id.in_(assignment_ids))
+    assignments = {
+        row.id: {"user_id": row.user_id, "ruangan_id": row.ruangan_id}
+        for row in db.session.query(RuanganUser.id, RuanganUser.user_id, RuanganUser.ruangan_id).filter(
+            or_(RuanganUser.user_id.in_(user_ids), RuanganUser.user_id.in_(owner_ids))
+        )
+    }
+    users = {
+        user.id: user
+        for user in db.session.query(User).filter(
+            User.id.in_(user_ids | {item["user_id"] for item in assignments.values()})
+        )
+    }
+    existing_rooms = {row.id for row in db.session.query(Ruangan.id).filter(Ruangan.id.in_(room_ids))}
+    pairs = {(item["user_id"], item["ruangan_id"]) for item in assignments.values()}
+
+    # jalankan operasi secara berurutan di memori, lalu tulis hasil bersihnya sekaligus
+    results: list[dict[str, object]] = []
+    pending: list[tuple[str, dict[str, object]]] = []
+    removed: set[int] = set()
+    moved: dict[int, int] = {}
+    created: list[dict[str, object]] = []
+
+    for index, op in enumerate(operations):
+        user_id = op.get("user_id")
+        room_id = op.get("ruangan_id")
+        assignment_id = op.get("assignment_id")
+
+        if index in invalid:
+            results.append(
+                {
+                    "index": index,
+                    "status": "error",
+                    "message": "user_id, ruangan_id, dan assignment_id harus berupa bilangan bulat",
+                }
+            )
+            continue
+        if user_id is None:
+            results.append({"index": index, "status": "error", "message": "user_id wajib diisi"})
+            continue
+        if user_id not in users:
+            results.append({"index": index, "status": "error", "message": "Pengguna tidak ditemukan"})
+            continue
+        if room_id is not None and room_id not in existing_rooms:
+            results.append({"index": index, "status": "error", "message": "Ruangan tidak ditemukan"})
+            continue
+
+        if assignment_id is not None:
+            assignment = assignments.get(assignment_id)
+            if assignment is None or assignment_id in removed:
+                results.append({"index": index, "status": "error", "message": "Relasi tidak ditemukan"})
+                continue
+            if (
+                room_id is not None
+                and room_id != assignment["ruangan_id"]
+                and (assignment["user_id"], room_id) in pairs
+            ):
+                results.append({"index": index, "status": "error", "message": "Pengguna sudah berada di ruangan tujuan"})
+                continue
+            owner = users.get(assignment["user_id"])
+            change = {
+                "assignment_id": assignment_id,
+                "user_id": assignment["user_id"],
+                "name": owner.name if owner else None,
+                "email": owner.email if owner else None,
+                "ruangan_id": room_id,
+                "from_ruangan_id": assignment["ruangan_id"],
+            }
+            pairs.discard((assignment["user_id"], assignment["ruangan_id"]))
+            if room_id is None:
+                removed.add(assignment_id)
+                moved.pop(assignment_id, None)
+                pending.append(("assignment.removed", change))
+                results.append({"index": index, "status": "removed", "assignment_id": assignment_id})
+            else:
+                assignment["ruangan_id"] = room_id
+                moved[assignment_id] = room_id
+                pairs.add((assignment["user_id"], room_id))
+                pending.append(("assignment.moved", change))
+                results.append({"index": index, "status": "moved", "assignment_id": assignment_id})
+            continue
+
+        if room_id is None:
+            results.append({"index": index, "status": "unchanged"})
+            continue
+        if (user_id, room_id) in pairs:
+            results.append({"index": index, "status": "exists"})
+            continue
+
+        pairs.add((user_id, room_id))
+        user = users[user_id]
+        change = {
+            "assignment_id": None,
+            "user_id": user_id,
+            "name": user.name,
+            "email": user.email,
+            "ruangan_id": room_id,
+        }
+        created.append(change)
+        pending.append(("assignment.added", change))
+        results.append({"index": index, "status": "created"})
+
+    table = RuanganUser.__table__
+    try:
+        if removed:
+            db.session.execute(
+                delete(table).where(table.c.id == bindparam("b_id")),
+                [{"b_id": assignment_id} for assignment_id in removed],
+            )
+        if moved:
+            # indeks unik (user_id, ruangan_id) diperiksa per baris; relasi yang dipindah diparkir
+            # ke NULL dulu agar pertukaran ruangan di dalam satu batch tidak bentrok di tengah jalan
+            db.session.execute(
+                update(table).where(table.c.id == bindparam("b_id")).values(ruangan_id=None),
+                [{"b_id": assignment_id} for assignment_id in moved],
+            )
+            db.session.execute(
+                update(table).where(table.c.id == bindparam("b_id")).values(ruangan_id=bindparam("b_ruangan_id")),
+                [{"b_id": assignment_id, "b_ruangan_id": room_id} for assignment_id, room_id in moved.items()],
+            )
+        if created:
+            new_ids = db.session.execute(
+                insert(table).returning(table.c.id, sort_by_parameter_order=True),
+                [{"user_id": change["user_id"], "ruangan_id": change["ruangan_id"]} for change in created],
+            ).scalars().all()
+            for change, new_id in zip(created, new_ids):
+                change["assignment_id"] = new_id
+            created_ids = iter(new_ids)
+            for result in results:
+                if result["status"] == "created":
+                    result["assignment_id"] = next(created_ids)
         db.session.commit()
+    except IntegrityError:
+        # permintaan lain mengubah relasi yang sama di antara validasi dan penulisan
+        db.session.rollback()
+        return jsonify({"message": "Penempatan bentrok dengan perubahan lain, muat ulang papan"}), 409
+
+    entries = [board_changes.record(kind, change) for kind, change in pending]
+    return delta_response({"results": results, **changes_payload(since, entries)})
 
-    return jsonify(build_board_payload())
+
+@app.get("/api/users/search")
+def api_search_users():
+    query = (request.args.get("q") or "").strip()
+    limit = page_size_arg("limit") or app.config.get("USER_SEARCH_LIMIT", 20)
+    if not query:
+        return jsonify({"message": "Parameter q wajib diisi"}), 400
+    users = [serialize_user(row) for row in search_users(read_session(), query, limit)]
+    return jsonify({"query": query, "users": users})
 
 
 @app.post("/api/users")
@@ -718,24 +1779,28 @@ def api_create_user():
     data = request.get_json(silent=True) or {}
     name = (data.get("name") or "").strip()
     email = (data.get("email") or "").strip()
+    since = requested_since()
 
     if not name or not email:
         return jsonify({"message": "Nama dan email wajib diisi"}), 400
 
-    if User.query.filter_by(email=email).first():
+    if repository.email_taken(db.session, email):
         return jsonify({"message": "Email sudah terdaftar"}), 409
 
     user = User(name=name, email=email)
     db.session.add(user)
     db.session.commit()
 
-    return jsonify({"message": "Pengguna dibuat", "board": build_board_payload()}), 201
+    change = serialize_user(user)
+    entry = board_changes.record("user.added", change)
+    return delta_response({"message": "Pengguna dibuat", **changes_payload(since, [entry])}, 201)
 
 
 @app.post("/api/rooms")
 def api_create_room():
     data = request.get_json(silent=True) or {}
     name = (data.get("name") or "").strip()
+    since = requested_since()
 
     if not name:
         return jsonify({"message": "Nama ruangan wajib diisi"}), 400
@@ -744,31 +1809,97 @@ def api_create_room():
     db.session.add(room)
     db.session.commit()
 
-    return jsonify({"message": "Ruangan dibuat", "board": build_board_payload()}), 201
+    change = {"id": room.id, "name": room.name}
+    entry = board_changes.record("room.added", change)
+    return delta_response({"message": "Ruangan dibuat", **changes_payload(since, [entry])}, 201)
+
+
+@app.post("/api/import")
+def api_import():
+    kind = request.args.get("kind", "")
+    since = requested_since()
+    upload = request.files.get("file")
+    fmt = request.args.get("format") or (importer.detect_format(upload.filename or "") if upload else "csv")
+
+    if kind not in importer.KINDS:
+        return jsonify({"message": "Parameter kind harus users, rooms, atau assignments"}), 400
+    if fmt not in importer.FORMATS:
+        return jsonify({"message": "Parameter format harus csv atau ndjson"}), 400
+
+    # baca langsung dari stream permintaan agar file besar tidak dimuat utuh ke memori
+    raw = upload.stream if upload else request.stream
+    stream = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+    stats = importer.ImportStats(kind=kind)
+    try:
+        importer.import_records(db.session, importer.iter_records(stream, fmt), kind, stats=stats)
+    except (ValueError, UnicodeDecodeError) as exc:
+        return import_failed(since, stats, f"Data tidak valid: {exc}", 400)
+    except IntegrityError:
+        # penulis lain memasukkan data yang sama selama impor berjalan
+        return import_failed(since, stats, "Data bentrok dengan perubahan lain, impor dihentikan", 409)
+
+    entry = board_changes.record("board.reloaded", {"kind": kind, "inserted": stats.inserted})
+    return delta_response({"message": "Impor selesai", "stats": stats.as_dict(), **changes_payload(since, [entry])})
+
+
+def import_failed(since: int | None, stats: importer.ImportStats, message: str, status: int):
+    """Respons impor gagal; potongan yang sudah di-commit tetap diumumkan ke klien papan."""
+    body = {"message": message, "committed": stats.committed}
+    if not stats.committed:
+        return jsonify(body), status
+    entry = board_changes.record("board.reloaded", {"kind": stats.kind, "inserted": stats.committed})
+    return delta_response({**body, **changes_payload(since, [entry])}, status)
+
+
+@app.get("/api/export")
+def api_export():
+    kind = request.args.get("kind", "")
+    fmt = request.args.get("format", "ndjson")
+    compress = request.args.get("gzip") in ("1", "true")
+
+    if kind not in exporter.TABLES:
+        return jsonify({"message": "Parameter kind harus users, rooms, atau assignments"}), 400
+    if fmt not in exporter.FORMATS:
+        return jsonify({"message": "Parameter format harus csv atau ndjson"}), 400
+
+    chunks = exporter.iter_export(read_session(), kind, fmt)
+    filename = f"{kind}.{fmt}"
+    mimetype = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    if compress:
+        chunks = exporter.gzip_chunks(chunks)
+        filename += ".gz"
+        mimetype = "application/gzip"
+    return app.response_class(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
 
 
 @app.delete("/api/rooms/<int:room_id>")
 def api_delete_room(room_id: int):
-    room = Ruangan.query.get(room_id)
-    if room is None:
+    since = requested_since()
+    # satu DELETE tanpa memuat ruangan; relasinya terhapus lewat ON DELETE CASCADE
+    if db.session.execute(delete(Ruangan).where(Ruangan.id == room_id)).rowcount == 0:
         return jsonify({"message": "Ruangan tidak ditemukan"}), 404
-
-    RuanganUser.query.filter_by(ruangan_id=room.id).delete()
-    db.session.delete(room)
     db.session.commit()
-    return jsonify(build_board_payload())
+
+    # relasi di ruangan ini ikut terhapus; klien membuangnya saat menerima room.removed
+    change = {"id": room_id}
+    entry = board_changes.record("room.removed", change)
+    return delta_response(changes_payload(since, [entry]))
 
 
 @app.delete("/api/users/<int:user_id>")
 def api_delete_user(user_id: int):
-    user = User.query.get(user_id)
-    if user is None:
+    since = requested_since()
+    if db.session.execute(delete(User).where(User.id == user_id)).rowcount == 0:
         return jsonify({"message": "Pengguna tidak ditemukan"}), 404
-
-    RuanganUser.query.filter_by(user_id=user.id).delete()
-    db.session.delete(user)
     db.session.commit()
-    return jsonify(build_board_payload())
+
+    change = {"id": user_id}
+    entry = board_changes.record("user.removed", change)
+    return delta_response(changes_payload(since, [entry]))
 
 
 if __name__ == "__main__":